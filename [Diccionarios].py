@@ -818,6 +818,44 @@ def paso_6_configuraciones_avanzadas():
     for dev_id, config in dispositivos_modbus["dispositivos"].items():
         template = dispositivos_modbus["templates"][config["template"]]
         print(f"   {dev_id}: {config['ip']}:{config['puerto']} ({template['unidad']})")
+        
+    # PLANES COMPILADOS: resolver cada template una sola vez (vista de solo lectura)
+    from types import MappingProxyType
+    
+    def compilar_planes(config_modbus):
+        return MappingProxyType({
+            dev_id: MappingProxyType({**config_modbus["templates"][config["template"]], **config})
+            for dev_id, config in config_modbus["dispositivos"].items()
+            if config["habilitado"]
+        })
+        
+    planes = compilar_planes(dispositivos_modbus)
+    try:
+        planes["TEMP_R001"]["scan_rate"] = 1.0
+    except TypeError:
+        print(f"\n🔒 Planes compilados (solo lectura): {list(planes)}")
+        
+    # Recarga en caliente: se compila aparte y se sustituye la referencia de una vez
+    nueva_config = {**dispositivos_modbus, "dispositivos": {
+        **dispositivos_modbus["dispositivos"],
+        "PRES_R001": {**dispositivos_modbus["dispositivos"]["PRES_R001"], "scan_rate": 1.0},
+    }}
+    planes_nuevos = compilar_planes(nueva_config)
+    print(f"   Recarga: PRES_R001 {planes['PRES_R001']['scan_rate']}s → "
+          f"{planes_nuevos['PRES_R001']['scan_rate']}s (plan anterior intacto)")
+          
+    # PLAN DE ESCANEO: cada dispositivo a su propio scan_rate (min-heap de plazos)
+    import heapq
+    
+    plazos = [(0.0, dev_id) for dev_id in planes]
+    heapq.heapify(plazos)
+    sondeos = []
+    while plazos and plazos[0][0] < 10.0:
+        instante, dev_id = heapq.heappop(plazos)
+        sondeos.append(f"{instante:.0f}s {dev_id}")
+        scan_rate = planes[dev_id]["scan_rate"]
+        heapq.heappush(plazos, (instante + scan_rate, dev_id))
+    print(f"\n⏰ Plan de escaneo (primeros 10 s): {', '.join(sondeos)}")
 
 def paso_7_ejemplo_integrador():
     """
@@ -19,6 +19,377 @@ SECUENCIA DE ENSEÑANZA DETALLADA - PROGRAMACIÓN ORIENTADA A OBJETOS
 ═══════════════════════════════════════════════════════════════════════════════
 """
 
+import asyncio
+import contextvars
+import heapq
+import logging
+import random
+import time
+from array import array
+from collections import deque
+from datetime import datetime
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+try:
+    import numpy as np   # Opcional: solo lo necesita el modo columnar (BancoSensores)
+except ImportError:
+    np = None
+
+try:
+    import orjson        # Opcional: codificador JSON rápido para exportaciones
+except ImportError:
+    orjson = None
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HERRAMIENTA: SERVICIO DE RELOJ (TIMESTAMPS ENTEROS EN NANOSEGUNDOS)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+FORMATO_TIMESTAMP = "%Y-%m-%d %H:%M:%S"
+
+class RelojSistema:
+    """
+    ⏱️ Fuente de tiempo real del sistema
+    
+    Las lecturas se marcan con enteros (ns desde epoch): obtenerlos cuesta
+    lo mismo que time.time(), y el texto legible se genera solo cuando un
+    reporte o una exportación lo pide.
+    """
+    
+    def ahora_ns(self):
+        """Tiempo de pared en ns desde epoch"""
+        return time.time_ns()
+    
+    def monotonico_ns(self):
+        """Tiempo monotónico en ns (para medir intervalos y plazos)"""
+        return time.monotonic_ns()
+    
+    def dormir(self, segundos):
+        time.sleep(segundos)
+
+class RelojSimulado:
+    """
+    🧪 Reloj simulado para pruebas y simulaciones reproducibles
+    
+    El tiempo solo avanza cuando se llama a avanzar() o dormir(); opcionalmente
+    avanza un paso fijo en cada consulta.
+    """
+    
+    def __init__(self, inicio_ns=1_700_000_000_000_000_000, paso_ns=0):
+        self.actual_ns = int(inicio_ns)
+        self.paso_ns = int(paso_ns)
+    
+    def ahora_ns(self):
+        actual = self.actual_ns
+        self.actual_ns += self.paso_ns
+        return actual
+    
+    def monotonico_ns(self):
+        return self.actual_ns
+    
+    def avanzar(self, segundos):
+        """⏩ Adelanta el reloj (segundos, admite fracciones)"""
+        self.actual_ns += int(segundos * 1_000_000_000)
+    
+    def dormir(self, segundos):
+        self.avanzar(segundos)
+
+class ServicioReloj:
+    """
+    🕐 Reloj compartido por sensores, SCADA y eventos
+    
+    Además de delegar en la fuente configurada permite "estampar" un ciclo
+    de escaneo: dentro de `with reloj.ciclo() as marca_ns:` todas las
+    lecturas comparten la misma marca y el reloj se consulta una sola vez.
+    """
+    
+    def __init__(self, fuente=None):
+        self.fuente = fuente or RelojSistema()
+        # La marca del ciclo es por contexto (hilo / tarea asyncio): un hilo de
+        # la API que consulta el reloj durante un escaneo obtiene la hora real
+        self._marca_ciclo = contextvars.ContextVar(f"marca_ciclo_{id(self)}", default=None)
+        # Caché (segundo, texto) del último segundo formateado; una sola tupla
+        # para que un lector concurrente nunca mezcle segundo y texto
+        self._cache_formato = (None, "")
+    
+    def configurar(self, fuente):
+        """🔧 Cambia la fuente de tiempo (p. ej. un RelojSimulado en pruebas)"""
+        self.fuente = fuente
+        self._marca_ciclo.set(None)
+    
+    def ahora_ns(self):
+        """Marca actual: la del ciclo en curso si hay uno abierto"""
+        marca = self._marca_ciclo.get()
+        if marca is not None:
+            return marca
+        return self.fuente.ahora_ns()
+    
+    def monotonico_ns(self):
+        return self.fuente.monotonico_ns()
+    
+    def dormir(self, segundos):
+        self.fuente.dormir(segundos)
+    
+    def ciclo(self):
+        """🔄 Context manager que fija una única marca para todo un ciclo de escaneo"""
+        return _CicloReloj(self)
+    
+    def formatear(self, epoch_ns):
+        """🖨️ ns epoch → "%Y-%m-%d %H:%M:%S" (solo se formatea una vez por segundo)"""
+        segundo = epoch_ns // 1_000_000_000
+        segundo_cache, texto = self._cache_formato
+        if segundo != segundo_cache:
+            texto = datetime.fromtimestamp(segundo).strftime(FORMATO_TIMESTAMP)
+            self._cache_formato = (segundo, texto)
+        return texto
+
+class _CicloReloj:
+    """Marca de ciclo reentrante: los ciclos anidados reutilizan la externa"""
+    
+    __slots__ = ("servicio", "token")
+    
+    def __init__(self, servicio):
+        self.servicio = servicio
+        self.token = None
+    
+    def __enter__(self):
+        marca = self.servicio._marca_ciclo.get()
+        if marca is None:
+            marca = self.servicio.fuente.ahora_ns()
+            self.token = self.servicio._marca_ciclo.set(marca)
+        return marca
+    
+    def __exit__(self, *exc):
+        if self.token is not None:
+            self.servicio._marca_ciclo.reset(self.token)
+            self.token = None
+        return False
+
+# Reloj global: tiempo real por defecto, reloj.configurar(RelojSimulado()) en pruebas
+reloj = ServicioReloj()
+
+# Enteros por debajo de este valor se interpretan como segundos epoch (no ns)
+_LIMITE_EPOCH_SEGUNDOS = 10**14
+
+def a_epoch_ns(timestamp=None):
+    """
+    🕐 Normaliza un timestamp a nanosegundos desde epoch (entero int64)
+    
+    Acepta None (ahora), un entero en ns, segundos epoch (float como
+    time.time(), o un entero pequeño), un datetime o un string con el
+    formato clásico "%Y-%m-%d %H:%M:%S" o ISO 8601.
+    """
+    if timestamp is None:
+        return reloj.ahora_ns()
+    if isinstance(timestamp, bool):
+        raise TypeError("Timestamp no soportado: bool")
+    if isinstance(timestamp, int):
+        # Un epoch en ns nunca es tan pequeño: es un epoch en segundos
+        if abs(timestamp) < _LIMITE_EPOCH_SEGUNDOS:
+            return timestamp * 1_000_000_000
+        return timestamp
+    if isinstance(timestamp, float):
+        return int(timestamp * 1_000_000_000)
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.strptime(timestamp, FORMATO_TIMESTAMP)
+        except ValueError:
+            timestamp = datetime.fromisoformat(timestamp)
+    if not isinstance(timestamp, datetime):
+        raise TypeError(f"Timestamp no soportado: {type(timestamp).__name__}")
+    return int(timestamp.timestamp() * 1_000_000_000)
+
+def formatear_timestamp(epoch_ns):
+    """🖨️ Convierte nanosegundos epoch al string legible usado en reportes"""
+    return reloj.formatear(int(epoch_ns))
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HERRAMIENTA: EVENTOS ESTRUCTURADOS Y SUMIDEROS (REEMPLAZO DE print())
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Evento:
+    """
+    📨 Evento estructurado: lectura, cambio de estado, registro, etc.
+    
+    En lugar de imprimir texto, las clases publican eventos y un "sumidero"
+    decide qué hacer con ellos (imprimir, registrar en lote, encolar...).
+    """
+    
+    __slots__ = ("tipo", "origen", "timestamp_ns", "datos")
+    
+    def __init__(self, tipo, origen, timestamp_ns, datos):
+        self.tipo = tipo
+        self.origen = origen
+        self.timestamp_ns = timestamp_ns
+        self.datos = datos
+    
+    def __repr__(self):
+        return f"Evento({self.tipo!r}, {self.origen!r}, {self.timestamp_ns}, {self.datos!r})"
+
+# Plantillas de texto por tipo de evento (mismos mensajes que los print() originales)
+PLANTILLAS_EVENTOS = {
+    "sensor_creado": "✅ Sensor {origen} inicializado en {ubicacion}",
+    "temperatura": "🌡️ {origen}: {valor}°C",
+    "dispositivo_modbus_creado": ("🔧 Dispositivo {origen} ({tipo_dispositivo}) creado\n"
+                                  "📡 IP: {ip} | Protocolo: {protocolo}"),
+    "conexion": "✅ {origen} conectado en {ip}",
+    "conexion_fallida": "❌ {origen}: {motivo}",
+    "registro_leido": "📊 {origen} - Registro {direccion}: {valores}",
+    "sensor_base_creado": "🏭 Sensor base {origen} inicializado",
+    "sensor_temperatura_creado": ("🌡️ Sensor de temperatura especializado creado\n"
+                                  "   Límites: {limite_min}°C a {limite_max}°C"),
+    "sensor_presion_creado": ("💨 Sensor de presión especializado creado\n"
+                              "   Presión máxima: {presion_maxima} bar"),
+    "lectura": "📊 {origen}: {valor} {unidad} ({hora})",
+    "alarma": "🚨 {origen}: {alarma} {accion}",
+    "scada_iniciado": "🏭 Sistema SCADA '{origen}' inicializado",
+    "dispositivo_registrado": "✅ Dispositivo {dispositivo} registrado",
+    "escaneo": "🔄 Escaneando {cantidad} dispositivos...",
+}
+
+def formatear_evento(evento):
+    """🖨️ Convierte un evento en el texto legible de su plantilla"""
+    plantilla = PLANTILLAS_EVENTOS.get(evento.tipo)
+    if plantilla is None:
+        return f"{evento.tipo} {evento.origen} {evento.datos}"
+    return plantilla.format(origen=evento.origen,
+                            hora=formatear_timestamp(evento.timestamp_ns),
+                            **evento.datos)
+
+class SumideroNulo:
+    """🕳️ Descarta todo: el camino deshabilitado casi no cuesta nada"""
+    
+    activo = False
+    
+    def publicar(self, evento):
+        pass
+    
+    def vaciar(self):
+        pass
+
+class SumideroConsola:
+    """🖥️ Imprime cada evento al instante (comportamiento clásico del temario)"""
+    
+    activo = True
+    
+    def publicar(self, evento):
+        print(formatear_evento(evento))
+    
+    def vaciar(self):
+        pass
+
+class SumideroLogLotes:
+    """
+    📦 Acumula eventos y los escribe al logger en LOTES
+    
+    Una sola llamada de logging por lote (tamano_lote eventos o intervalo_s
+    segundos, lo que ocurra primero) en lugar de una escritura por lectura.
+    """
+    
+    activo = True
+    
+    def __init__(self, logger=None, tamano_lote=500, intervalo_s=1.0):
+        self.logger = logger or logging.getLogger("scada.eventos")
+        self.tamano_lote = tamano_lote
+        self.intervalo_ns = int(intervalo_s * 1_000_000_000)
+        self._pendientes = []
+        self._ultimo_vaciado = time.monotonic_ns()
+    
+    def publicar(self, evento):
+        self._pendientes.append(evento)
+        if (len(self._pendientes) >= self.tamano_lote
+                or time.monotonic_ns() - self._ultimo_vaciado >= self.intervalo_ns):
+            self.vaciar()
+    
+    def vaciar(self):
+        """Escribe todos los eventos pendientes en un solo registro de log"""
+        if self._pendientes:
+            self.logger.info("\n".join(formatear_evento(e) for e in self._pendientes))
+            self._pendientes = []
+        self._ultimo_vaciado = time.monotonic_ns()
+
+class SumideroCola:
+    """
+    📥 Cola en memoria acotada: otro hilo/tarea la drena cuando quiera
+    
+    Si se llena, se descartan los eventos más antiguos (deque con maxlen).
+    """
+    
+    activo = True
+    
+    def __init__(self, capacidad=10_000):
+        self.cola = deque(maxlen=capacidad)
+    
+    def publicar(self, evento):
+        self.cola.append(evento)
+    
+    def drenar(self, maximo=None):
+        """Extrae hasta `maximo` eventos (todos si es None), del más antiguo al más nuevo"""
+        cantidad = len(self.cola) if maximo is None else min(maximo, len(self.cola))
+        return [self.cola.popleft() for _ in range(cantidad)]
+    
+    def vaciar(self):
+        pass
+
+class SumideroCallback:
+    """📞 Entrega los eventos a una función, de a uno o en lotes"""
+    
+    activo = True
+    
+    def __init__(self, funcion, tamano_lote=1):
+        self.funcion = funcion
+        self.tamano_lote = tamano_lote
+        self._pendientes = []
+    
+    def publicar(self, evento):
+        if self.tamano_lote <= 1:
+            self.funcion(evento)
+            return
+        self._pendientes.append(evento)
+        if len(self._pendientes) >= self.tamano_lote:
+            self.vaciar()
+    
+    def vaciar(self):
+        if self._pendientes:
+            lote, self._pendientes = self._pendientes, []
+            self.funcion(lote)
+
+class CanalEventos:
+    """
+    📡 Punto único de publicación de eventos del módulo
+    
+    En el camino caliente se consulta `eventos.activo` ANTES de armar el
+    evento: con SumideroNulo no se crea ningún objeto.
+    """
+    
+    def __init__(self, sumidero=None):
+        self.configurar(sumidero or SumideroConsola())
+    
+    def configurar(self, sumidero):
+        """🔧 Cambia el sumidero activo (vaciando el anterior)"""
+        anterior = getattr(self, "sumidero", None)
+        if anterior is not None:
+            anterior.vaciar()
+        self.sumidero = sumidero
+        self.activo = sumidero.activo
+    
+    def publicar(self, tipo, origen, timestamp_ns=None, **datos):
+        if not self.activo:
+            return
+        if timestamp_ns is None:
+            timestamp_ns = reloj.ahora_ns()
+        self.sumidero.publicar(Evento(tipo, origen, timestamp_ns, datos))
+    
+    def vaciar(self):
+        self.sumidero.vaciar()
+
+# Canal global: por defecto imprime en consola como siempre
+eventos = CanalEventos()
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # PASO 1: INTRODUCCIÓN A CLASES Y OBJETOS - CONCEPTOS FUNDAMENTALES
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -49,6 +420,129 @@ def paso_1_conceptos_fundamentales():
     print("• Cada objeto tiene sus propios valores de atributos")
     print("• Todos comparten los mismos métodos definidos en la clase")
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# HERRAMIENTA: ESTADÍSTICAS INCREMENTALES O(1)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class EstadisticasIncrementales:
+    """
+    📈 Acumulador de estadísticas que se actualiza con cada lectura
+    
+    Usa el algoritmo de Welford para media y varianza: numéricamente estable
+    y sin necesidad de guardar el historial. Consultar el resumen cuesta O(1)
+    sin importar cuántas lecturas haya procesado el sensor.
+    """
+    
+    __slots__ = ("cantidad", "media", "_m2", "minimo", "maximo", "ultimo")
+    
+    def __init__(self):
+        self.cantidad = 0
+        self.media = 0.0
+        self._m2 = 0.0          # Suma de cuadrados de las desviaciones
+        self.minimo = None
+        self.maximo = None
+        self.ultimo = None
+    
+    def agregar(self, valor):
+        """➕ Incorpora una lectura en O(1)"""
+        self.cantidad += 1
+        delta = valor - self.media
+        self.media += delta / self.cantidad
+        self._m2 += delta * (valor - self.media)
+        
+        if self.minimo is None or valor < self.minimo:
+            self.minimo = valor
+        if self.maximo is None or valor > self.maximo:
+            self.maximo = valor
+        self.ultimo = valor
+    
+    @property
+    def varianza(self):
+        """Varianza muestral (0.0 con menos de 2 lecturas)"""
+        if self.cantidad < 2:
+            return 0.0
+        return self._m2 / (self.cantidad - 1)
+    
+    @property
+    def desviacion(self):
+        """Desviación estándar muestral"""
+        return self.varianza ** 0.5
+    
+    def resumen(self):
+        """📋 Diccionario con todas las estadísticas acumuladas"""
+        return {
+            "cantidad": self.cantidad,
+            "media": self.media,
+            "varianza": self.varianza,
+            "desviacion": self.desviacion,
+            "minimo": self.minimo,
+            "maximo": self.maximo,
+            "ultimo": self.ultimo
+        }
+
+class EstadisticasVentana(EstadisticasIncrementales):
+    """
+    🪟 Estadísticas sobre las últimas N lecturas (ventana deslizante)
+    
+    - Media y varianza: Welford con "des-actualización" del valor que sale
+    - Mínimo y máximo: colas monótonas (costo amortizado O(1))
+    """
+    
+    __slots__ = ("tamano", "_ventana", "_indice", "_cola_min", "_cola_max")
+    
+    def __init__(self, tamano):
+        if tamano <= 0:
+            raise ValueError("El tamaño de la ventana debe ser mayor que 0")
+        super().__init__()
+        self.tamano = tamano
+        self._ventana = deque()
+        self._indice = 0
+        self._cola_min = deque()   # (indice, valor) con valores crecientes
+        self._cola_max = deque()   # (indice, valor) con valores decrecientes
+    
+    def agregar(self, valor):
+        """➕ Incorpora una lectura y retira la más antigua si la ventana está llena"""
+        if len(self._ventana) == self.tamano:
+            self._retirar(self._ventana.popleft())
+        
+        self._ventana.append(valor)
+        self.cantidad += 1
+        delta = valor - self.media
+        self.media += delta / self.cantidad
+        self._m2 += delta * (valor - self.media)
+        self.ultimo = valor
+        
+        # Mantener colas monótonas para min/max de la ventana
+        indice = self._indice
+        self._indice += 1
+        while self._cola_min and self._cola_min[-1][1] >= valor:
+            self._cola_min.pop()
+        self._cola_min.append((indice, valor))
+        while self._cola_max and self._cola_max[-1][1] <= valor:
+            self._cola_max.pop()
+        self._cola_max.append((indice, valor))
+        
+        limite = self._indice - self.tamano
+        if self._cola_min[0][0] < limite:
+            self._cola_min.popleft()
+        if self._cola_max[0][0] < limite:
+            self._cola_max.popleft()
+        self.minimo = self._cola_min[0][1]
+        self.maximo = self._cola_max[0][1]
+    
+    def _retirar(self, valor):
+        """➖ Quita de media/varianza el efecto de una lectura que sale de la ventana"""
+        self.cantidad -= 1
+        if self.cantidad == 0:
+            self.media = 0.0
+            self._m2 = 0.0
+            return
+        media_anterior = self.media
+        self.media -= (valor - media_anterior) / self.cantidad
+        self._m2 -= (valor - media_anterior) * (valor - self.media)
+        if self._m2 < 0:
+            self._m2 = 0.0   # Protección ante redondeo
+
 # PRIMERA CLASE: SENSOR INDUSTRIAL BÁSICO
 class SensorTemperatura:
     """
@@ -61,6 +555,9 @@ class SensorTemperatura:
     - Redes de monitoreo PyModbus
     """
     
+    # Tamaño de la ventana deslizante de estadísticas (últimas N lecturas)
+    ventana_estadisticas = 60
+    
     def __init__(self, id_sensor, ubicacion, temperatura_inicial=20.0):
         """
         🔧 CONSTRUCTOR: Se ejecuta automáticamente al crear un objeto
@@ -78,7 +575,13 @@ class SensorTemperatura:
         self.alarmas_activas = []
         self.historial_lecturas = [temperatura_inicial]
         
-        print(f"✅ Sensor {id_sensor} inicializado en {ubicacion}")
+        # Estadísticas incrementales: reportes en O(1)
+        self.estadisticas = EstadisticasIncrementales()
+        self.estadisticas_ventana = EstadisticasVentana(self.ventana_estadisticas)
+        self.estadisticas.agregar(temperatura_inicial)
+        self.estadisticas_ventana.agregar(temperatura_inicial)
+        
+        eventos.publicar("sensor_creado", id_sensor, ubicacion=ubicacion)
     
     def leer_temperatura(self):
         """
@@ -98,11 +601,14 @@ class SensorTemperatura:
         """
         self.temperatura_actual = nueva_temperatura
         self.historial_lecturas.append(nueva_temperatura)
+        self.estadisticas.agregar(nueva_temperatura)
+        self.estadisticas_ventana.agregar(nueva_temperatura)
         
         # Verificar alarmas
         self._verificar_alarmas()
         
-        print(f"🌡️ {self.id_sensor}: {nueva_temperatura}°C")
+        if eventos.activo:
+            eventos.publicar("temperatura", self.id_sensor, valor=nueva_temperatura)
     
     def _verificar_alarmas(self):
         """
@@ -126,20 +632,25 @@ class SensorTemperatura:
     
     def obtener_estadisticas(self):
         """
-        📈 Método para calcular estadísticas del historial
+        📈 Método para obtener estadísticas del historial
+        
+        Lee el acumulador incremental: O(1) sin recorrer el historial.
         
         Returns:
             dict: Diccionario con estadísticas calculadas
         """
-        if not self.historial_lecturas:
+        stats = self.estadisticas
+        if not stats.cantidad:
             return {"error": "No hay lecturas disponibles"}
         
         return {
-            "temperatura_promedio": sum(self.historial_lecturas) / len(self.historial_lecturas),
-            "temperatura_maxima": max(self.historial_lecturas),
-            "temperatura_minima": min(self.historial_lecturas),
-            "total_lecturas": len(self.historial_lecturas),
-            "ultima_lectura": self.historial_lecturas[-1]
+            "temperatura_promedio": stats.media,
+            "temperatura_maxima": stats.maximo,
+            "temperatura_minima": stats.minimo,
+            "desviacion_estandar": stats.desviacion,
+            "total_lecturas": stats.cantidad,
+            "ultima_lectura": stats.ultimo,
+            "ventana": self.estadisticas_ventana.resumen()
         }
     
     def generar_reporte(self):
@@ -212,6 +723,76 @@ def paso_2_creacion_uso_objetos():
     sensor_reactor_b.generar_reporte()
     sensor_intercambiador.generar_reporte()
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# HERRAMIENTA: POOL DE CONEXIONES MODBUS POR GATEWAY
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ConexionGateway:
+    """🔌 Conexión TCP (simulada) con un gateway, compartida por sus dispositivos"""
+    
+    __slots__ = ("ip", "puerto", "abierta", "handshakes", "dispositivos",
+                 "fallos", "proximo_intento_ns")
+                 
+    def __init__(self, ip, puerto):
+        self.ip = ip
+        self.puerto = puerto
+        self.abierta = False
+        self.handshakes = 0
+        self.dispositivos = 0
+        self.fallos = 0
+        self.proximo_intento_ns = 0
+
+class PoolConexionesModbus:
+    """
+    🔌 Una conexión persistente por (ip, puerto)
+    
+    Los dispositivos detrás del mismo gateway comparten el socket: solo el
+    primero paga el handshake. Si la conexión cae, el siguiente intento
+    espera un backoff exponencial con jitter para no saturar al gateway.
+    """
+    
+    def __init__(self, backoff_base_s=0.5, backoff_max_s=30.0):
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self._conexiones = {}
+        
+    def obtener(self, ip, puerto):
+        """Conexión abierta con el gateway, o None si está en backoff"""
+        conexion = self._conexiones.get((ip, puerto))
+        if conexion is None:
+            conexion = self._conexiones[(ip, puerto)] = ConexionGateway(ip, puerto)
+        if not conexion.abierta:
+            if reloj.monotonico_ns() < conexion.proximo_intento_ns:
+                return None
+            conexion.abierta = True
+            conexion.handshakes += 1
+        return conexion
+        
+    def marcar_exito(self, ip, puerto):
+        """✅ Una transacción completa demuestra que el enlace está sano: reinicia el backoff"""
+        conexion = self._conexiones.get((ip, puerto))
+        if conexion is not None:
+            conexion.fallos = 0
+            
+    def marcar_caida(self, ip, puerto):
+        """💥 Cierra la conexión y programa la reconexión con backoff + jitter"""
+        conexion = self._conexiones.get((ip, puerto))
+        if conexion is None:
+            return
+        conexion.abierta = False
+        conexion.fallos += 1
+        techo = min(self.backoff_max_s, self.backoff_base_s * 2 ** (conexion.fallos - 1))
+        conexion.proximo_intento_ns = (reloj.monotonico_ns()
+                                       + int(random.uniform(0, techo) * 1_000_000_000))
+                                       
+    def estadisticas(self):
+        return {f"{ip}:{puerto}": {"abierta": c.abierta, "handshakes": c.handshakes,
+                                   "dispositivos": c.dispositivos, "fallos": c.fallos}
+                for (ip, puerto), c in self._conexiones.items()}
+
+# Pool global: DispositivoModbus.conectar() toma de aquí la conexión de su gateway
+conexiones_modbus = PoolConexionesModbus()
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # PASO 3: ATRIBUTOS DE CLASE VS ATRIBUTOS DE INSTANCIA
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -243,8 +824,9 @@ class DispositivoModbus:
         # Incrementar contador de clase
         DispositivoModbus.dispositivos_totales += 1
         
-        print(f"🔧 Dispositivo {id_dispositivo} ({tipo_dispositivo}) creado")
-        print(f"📡 IP: {ip_address} | Protocolo: {self.protocolo}")
+        eventos.publicar("dispositivo_modbus_creado", id_dispositivo,
+                         tipo_dispositivo=tipo_dispositivo, ip=ip_address,
+                         protocolo=self.protocolo)
     
     @classmethod
     def obtener_info_protocolo(cls):
@@ -277,25 +859,87 @@ class DispositivoModbus:
             return False
     
     def conectar(self):
-        """Simula conexión al dispositivo"""
-        if self.validar_ip(self.ip_address):
-            self.estado_conexion = "conectado"
-            print(f"✅ {self.id_dispositivo} conectado en {self.ip_address}")
-        else:
-            print(f"❌ IP inválida para {self.id_dispositivo}")
+        """Simula conexión al dispositivo (compartiendo la del gateway)"""
+        if not self.validar_ip(self.ip_address):
+            eventos.publicar("conexion_fallida", self.id_dispositivo, motivo="IP inválida")
+            return
+        if self.estado_conexion == "conectado":
+            return
+        conexion = conexiones_modbus.obtener(self.ip_address, self.puerto_default)
+        if conexion is None:
+            eventos.publicar("conexion_fallida", self.id_dispositivo,
+                             motivo="gateway en espera de reconexión")
+            return
+        conexion.dispositivos += 1
+        self.estado_conexion = "conectado"
+        eventos.publicar("conexion", self.id_dispositivo, ip=self.ip_address)
     
     def leer_registro(self, direccion, cantidad=1):
         """Simula lectura de registros Modbus"""
         if self.estado_conexion != "conectado":
-            print(f"❌ {self.id_dispositivo} no está conectado")
+            eventos.publicar("conexion_fallida", self.id_dispositivo, motivo="no está conectado")
             return None
         
         # Simular datos
         import random
         valores = [random.randint(0, 1000) for _ in range(cantidad)]
         self.registros_leidos[direccion] = valores
+        conexiones_modbus.marcar_exito(self.ip_address, self.puerto_default)
+        
+        if eventos.activo:
+            eventos.publicar("registro_leido", self.id_dispositivo,
+                             direccion=direccion, valores=valores)
+        return valores
+        
+    # Máximo de registros por petición del protocolo Modbus
+    maximo_registros = 125
+    
+    def leer_registros(self, rangos, hueco_maximo=8):
+        """
+        📦 Lee varios rangos {direccion: cantidad} con el mínimo de peticiones
+        
+        Los rangos contiguos o separados por un hueco pequeño se fusionan en
+        un solo leer_registro (sin superar maximo_registros) y la respuesta se
+        reparte después entre las direcciones pedidas.
+        """
+        bloques = []
+        for direccion, cantidad in sorted(rangos.items()):
+            fin = direccion + cantidad
+            if (bloques and direccion - bloques[-1][1] <= hueco_maximo
+                    and max(bloques[-1][1], fin) - bloques[-1][0] <= self.maximo_registros):
+                bloques[-1][1] = max(bloques[-1][1], fin)
+                bloques[-1][2].append(direccion)
+            else:
+                bloques.append([direccion, fin, [direccion]])
+                
+        resultado = {}
+        for inicio, fin, direcciones in bloques:
+            valores = self.leer_registro(inicio, fin - inicio)
+            if valores is None:
+                return None
+            for direccion in direcciones:
+                desplazamiento = direccion - inicio
+                resultado[direccion] = valores[desplazamiento:desplazamiento + rangos[direccion]]
+        return resultado
+        
+    # Latencia simulada de red (segundos) para la versión asíncrona
+    latencia_simulada = (0.01, 0.05)
+    
+    async def leer_registro_async(self, direccion, cantidad=1):
+        """
+        ⏳ Versión asíncrona (coroutine) de leer_registro
+        
+        Mientras "espera la respuesta de red" cede el control al event loop,
+        así otros dispositivos pueden leerse al mismo tiempo.
+        """
+        if self.estado_conexion != "conectado":
+            eventos.publicar("conexion_fallida", self.id_dispositivo, motivo="no está conectado")
+            return None
         
-        print(f"📊 {self.id_dispositivo} - Registro {direccion}: {valores}")
+        await asyncio.sleep(random.uniform(*self.latencia_simulada))
+        valores = [random.randint(0, 1000) for _ in range(cantidad)]
+        self.registros_leidos[direccion] = valores
+        conexiones_modbus.marcar_exito(self.ip_address, self.puerto_default)
         return valores
 
 def paso_3_atributos_clase_instancia():
@@ -334,167 +978,655 @@ def paso_3_atributos_clase_instancia():
     for dispositivo in [plc_principal, sensor_red, actuador_valvula]:
         dispositivo.conectar()
         dispositivo.leer_registro(40001, 3)
+    
+    # Tres rangos cercanos del mismo PLC se leen en una sola petición
+    lecturas = plc_principal.leer_registros({40001: 2, 40003: 1, 40010: 4})
+    print(f"\n📦 Lectura agrupada: {lecturas}")
+    
+    # Otro esclavo detrás del mismo gateway reutiliza la conexión abierta
+    rtu_remota = DispositivoModbus("RTU_004", "192.168.1.100", "RTU")
+    rtu_remota.conectar()
+    print(f"🔌 Gateway 192.168.1.100: {conexiones_modbus.estadisticas()['192.168.1.100:502']}")
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PASO 4: HERENCIA - CREANDO JERARQUÍAS DE CLASES
 # ═══════════════════════════════════════════════════════════════════════════════
 
-class SensorIndustrial:
+class HistorialLista:
     """
-    🏭 CLASE BASE: Funcionalidad común a todos los sensores industriales
+    📚 BACKEND DE HISTORIAL: Lista ilimitada (comportamiento clásico)
     
-    Esta será la clase padre de la que heredarán sensores específicos
+    Guarda tuplas (timestamp, valor) en una lista que crece sin límite.
+    Útil para ejemplos cortos; en procesos de semanas es una fuga de memoria.
     """
     
-    def __init__(self, id_sensor, ubicacion, unidad_medida):
-        self.id_sensor = id_sensor
-        self.ubicacion = ubicacion
-        self.unidad_medida = unidad_medida
-        self.estado = "operativo"
-        self.historial = []
-        self.alarmas = []
-        
-        print(f"🏭 Sensor base {id_sensor} inicializado")
+    __slots__ = ("_lecturas", "total_registrado")
     
-    def registrar_lectura(self, valor, timestamp=None):
-        """Método común para registrar lecturas"""
-        if timestamp is None:
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        self.historial.append((timestamp, valor))
-        self.verificar_alarmas(valor)
-        
-        print(f"📊 {self.id_sensor}: {valor} {self.unidad_medida} ({timestamp})")
+    def __init__(self):
+        self._lecturas = []
+        self.total_registrado = 0
     
-    def verificar_alarmas(self, valor):
-        """Método base para verificar alarmas - será sobrescrito por clases hijas"""
-        pass
+    def registrar(self, valor, timestamp=None):
+        """Agrega una lectura y devuelve su timestamp en ns"""
+        epoch_ns = a_epoch_ns(timestamp)
+        self._lecturas.append((epoch_ns, valor))
+        self.total_registrado += 1
+        return epoch_ns
     
-    def obtener_ultima_lectura(self):
-        """Obtener la lectura más reciente"""
-        if self.historial:
-            return self.historial[-1]
-        return None
+    def ultima(self):
+        """Lectura más reciente como (timestamp_str, valor) o None"""
+        if not self._lecturas:
+            return None
+        epoch_ns, valor = self._lecturas[-1]
+        return (formatear_timestamp(epoch_ns), valor)
     
-    def generar_reporte_base(self):
-        """Generar reporte básico común a todos los sensores"""
-        print(f"\n📋 REPORTE SENSOR {self.id_sensor}")
-        print(f"📍 Ubicación: {self.ubicacion}")
-        print(f"📊 Estado: {self.estado}")
-        print(f"📈 Total lecturas: {len(self.historial)}")
-        
-        if self.alarmas:
-            print(f"🚨 Alarmas: {', '.join(self.alarmas)}")
+    def valores(self, n=None):
+        """Valores de las últimas n lecturas (todas si n es None)"""
+        if n is None or n >= len(self._lecturas):
+            return [valor for _, valor in self._lecturas]
+        return [valor for _, valor in self._lecturas[-n:]] if n > 0 else []
+    
+    def timestamps(self, n=None):
+        """Timestamps (ns) de las últimas n lecturas"""
+        if n is None or n >= len(self._lecturas):
+            return [epoch_ns for epoch_ns, _ in self._lecturas]
+        return [epoch_ns for epoch_ns, _ in self._lecturas[-n:]] if n > 0 else []
+    
+    def __len__(self):
+        return len(self._lecturas)
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [(formatear_timestamp(epoch_ns), valor)
+                    for epoch_ns, valor in self._lecturas[indice]]
+        epoch_ns, valor = self._lecturas[indice]
+        return (formatear_timestamp(epoch_ns), valor)
+    
+    def cargar(self, valores, timestamps, total_registrado=None):
+        """📥 Reemplaza el contenido por lecturas ya ordenadas (restauración)"""
+        self._lecturas = list(zip((int(t) for t in timestamps), valores))
+        self.total_registrado = (len(self._lecturas) if total_registrado is None
+                                 else total_registrado)
+    
+    def __iter__(self):
+        for epoch_ns, valor in self._lecturas:
+            yield (formatear_timestamp(epoch_ns), valor)
 
-class SensorTemperaturaAvanzado(SensorIndustrial):
+class HistorialCircular:
     """
-    🌡️ CLASE HIJA: Sensor de temperatura con funcionalidades específicas
+    🔁 BACKEND DE HISTORIAL: Buffer circular de capacidad fija
     
-    HEREDA de SensorIndustrial y AÑADE funcionalidad específica
+    Usa dos arrays paralelos: array('d') para valores y array('q') (int64)
+    para timestamps en nanosegundos. Cada lectura se escribe dos veces
+    (posición i y posición i + capacidad); así la ventana de las últimas N
+    lecturas SIEMPRE es contigua en memoria y se puede devolver como un
+    memoryview sin copiar datos.
+    
+    💡 ANALOGÍA INDUSTRIAL: Es como el registrador gráfico de un panel: el papel
+    tiene un largo fijo y lo más antiguo se sobrescribe con lo más nuevo.
+    
+    ⚡ COSTO: agregar y desalojar son O(1); la memoria es constante.
     """
     
-    def __init__(self, id_sensor, ubicacion, limite_min=-10, limite_max=100):
-        # Llamar al constructor de la clase padre
-        super().__init__(id_sensor, ubicacion, "°C")
-        
-        # Atributos específicos de temperatura
-        self.limite_min = limite_min
-        self.limite_max = limite_max
-        self.tipo_sensor = "Temperatura"
-        
-        print(f"🌡️ Sensor de temperatura especializado creado")
-        print(f"   Límites: {limite_min}°C a {limite_max}°C")
+    __slots__ = ("capacidad", "_valores", "_timestamps", "_ultimo", "_cantidad",
+                 "total_registrado")
     
-    def verificar_alarmas(self, temperatura):
-        """
-        SOBRESCRIBIR método padre con lógica específica de temperatura
-        """
-        self.alarmas.clear()
+    def __init__(self, capacidad=1000):
+        if capacidad <= 0:
+            raise ValueError("La capacidad del historial debe ser mayor que 0")
         
-        if temperatura > self.limite_max:
-            self.alarmas.append("TEMPERATURA_ALTA")
-            self.estado = "alarma_alta"
-        elif temperatura < self.limite_min:
-            self.alarmas.append("TEMPERATURA_BAJA")
-            self.estado = "alarma_baja"
-        else:
-            self.estado = "operativo"
+        self.capacidad = capacidad
+        self._valores = array('d', [0.0]) * (2 * capacidad)
+        self._timestamps = array('q', [0]) * (2 * capacidad)
+        self._ultimo = capacidad - 1   # Posición de la lectura más reciente
+        self._cantidad = 0
+        self.total_registrado = 0      # Lecturas históricas (incluye desalojadas)
     
-    def calcular_eficiencia_termica(self):
+    def registrar(self, valor, timestamp=None):
         """
-        MÉTODO ESPECÍFICO: Solo los sensores de temperatura lo tienen
-        """
-        if len(self.historial) < 2:
-            return None
+        ➕ Agrega una lectura en O(1), desalojando la más antigua si está lleno
         
-        # Calcular estabilidad térmica
-        temperaturas = [lectura[1] for lectura in self.historial]
-        variacion = max(temperaturas) - min(temperaturas)
+        Returns:
+            int: Timestamp de la lectura en nanosegundos
+        """
+        epoch_ns = a_epoch_ns(timestamp)
+        posicion = self._ultimo + 1
+        if posicion == self.capacidad:
+            posicion = 0
         
-        # Eficiencia basada en estabilidad (menos variación = más eficiente)
-        eficiencia = max(0, 100 - (variacion * 2))
+        # Escritura espejo: mantiene contigua cualquier ventana de hasta N lecturas
+        self._valores[posicion] = valor
+        self._valores[posicion + self.capacidad] = valor
+        self._timestamps[posicion] = epoch_ns
+        self._timestamps[posicion + self.capacidad] = epoch_ns
         
-        return {
-            "eficiencia_termica": eficiencia,
-            "variacion_maxima": variacion,
-            "temperatura_promedio": sum(temperaturas) / len(temperaturas)
-        }
+        self._ultimo = posicion
+        if self._cantidad < self.capacidad:
+            self._cantidad += 1
+        self.total_registrado += 1
+        return epoch_ns
     
-    def generar_reporte(self):
-        """
-        EXTENDER funcionalidad del método padre
+    def _ventana(self, n):
+        """Rango [inicio, fin) de las últimas n lecturas dentro de los arrays"""
+        if n is None or n > self._cantidad:
+            n = self._cantidad
+        fin = self._ultimo + self.capacidad + 1
+        return fin - max(n, 0), fin
+    
+    def valores(self, n=None):
         """
-        # Llamar al reporte base del padre
-        self.generar_reporte_base()
-        
-        # Agregar información específica de temperatura
-        print(f"🌡️ Tipo: {self.tipo_sensor}")
-        print(f"🔥 Límite máximo: {self.limite_max}°C")
-        print(f"❄️ Límite mínimo: {self.limite_min}°C")
+        📊 Vista sin copia (memoryview) de los últimos n valores
         
-        eficiencia = self.calcular_eficiencia_termica()
-        if eficiencia:
-            print(f"⚡ Eficiencia térmica: {eficiencia['eficiencia_termica']:.1f}%")
-            print(f"📊 Temp. promedio: {eficiencia['temperatura_promedio']:.1f}°C")
-
-class SensorPresion(SensorIndustrial):
-    """
-    💨 CLASE HIJA: Sensor de presión con funcionalidades específicas
-    """
+        Ordenados de más antiguo a más reciente. Funciona directamente con
+        sum(), max(), min() o numpy.frombuffer().
+        """
+        inicio, fin = self._ventana(n)
+        return memoryview(self._valores)[inicio:fin]
+    
+    def timestamps(self, n=None):
+        """🕐 Vista sin copia de los últimos n timestamps (ns, int64)"""
+        inicio, fin = self._ventana(n)
+        return memoryview(self._timestamps)[inicio:fin]
     
-    def __init__(self, id_sensor, ubicacion, presion_maxima=10.0):
-        super().__init__(id_sensor, ubicacion, "bar")
+    def cargar(self, valores, timestamps, total_registrado=None):
+        """
+        📥 Reemplaza el contenido por lecturas ya ordenadas (restauración)
         
-        self.presion_maxima = presion_maxima
+        Acepta cualquier buffer 'd'/'q' (por ejemplo memoryviews sobre un
+        archivo mmap): se copia en bloque, sin recorrer lectura por lectura.
+        Si hay más lecturas que capacidad, se conservan las más recientes.
+        """
+        n = min(len(valores), self.capacidad)
+        valores = memoryview(valores)[len(valores) - n:]
+        timestamps = memoryview(timestamps)[len(timestamps) - n:]
+        destino_v = memoryview(self._valores)
+        destino_t = memoryview(self._timestamps)
+        destino_v[:n] = valores
+        destino_v[self.capacidad:self.capacidad + n] = valores
+        destino_t[:n] = timestamps
+        destino_t[self.capacidad:self.capacidad + n] = timestamps
+        self._ultimo = n - 1 if n else self.capacidad - 1
+        self._cantidad = n
+        self.total_registrado = n if total_registrado is None else total_registrado
+    
+    def ultima(self):
+        """Lectura más reciente como (timestamp_str, valor) o None"""
+        if not self._cantidad:
+            return None
+        return (formatear_timestamp(self._timestamps[self._ultimo]),
+                self._valores[self._ultimo])
+    
+    def __len__(self):
+        return self._cantidad
+    
+    def __getitem__(self, indice):
+        """Acceso por índice o slice compatible con la lista clásica: (timestamp, valor)"""
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(self._cantidad))]
+        if indice < 0:
+            indice += self._cantidad
+        if not 0 <= indice < self._cantidad:
+            raise IndexError("Índice fuera del historial")
+        inicio, _ = self._ventana(None)
+        posicion = inicio + indice
+        return (formatear_timestamp(self._timestamps[posicion]), self._valores[posicion])
+    
+    def __iter__(self):
+        inicio, fin = self._ventana(None)
+        for posicion in range(inicio, fin):
+            yield (formatear_timestamp(self._timestamps[posicion]), self._valores[posicion])
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HERRAMIENTA: MOTOR DE ALARMAS POR TABLA (HI/HIHI/LO/LOLO + HISTÉRESIS)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TablaAlarmas:
+    """
+    📋 Tabla compilada de umbrales de alarma
+    
+    Se construye a partir de una lista de diccionarios (uno por umbral), en
+    orden de PRIORIDAD (el primero es el más importante):
+    
+        {"nombre": "PRESION_CRITICA", "tipo": "HIHI", "limite": 8.0,
+         "banda_muerta": 0.1, "retardo_on": 2.0, "retardo_off": 5.0,
+         "estado": "emergencia"}
+    
+    - tipo: HI / HIHI (por encima del límite) o LO / LOLO (por debajo)
+    - banda_muerta: la alarma solo se normaliza al volver límite ∓ banda
+    - retardo_on / retardo_off: segundos que la condición debe mantenerse
+      antes de activar / normalizar la alarma
+    
+    Al compilar, cada columna se guarda en una tupla para que la evaluación
+    no tenga que buscar claves en diccionarios.
+    """
+    
+    # tipo → (dirección, severidad)
+    TIPOS = {"HIHI": (1, 2), "HI": (1, 1), "LO": (-1, 1), "LOLO": (-1, 2)}
+    
+    def __init__(self, umbrales):
+        nombres, direcciones, severidades, limites, resets = [], [], [], [], []
+        retardos_on, retardos_off, estados = [], [], []
+        
+        for umbral in umbrales:
+            if umbral["tipo"] not in self.TIPOS:
+                raise ValueError(f"Tipo de umbral desconocido: {umbral['tipo']}")
+            direccion, severidad = self.TIPOS[umbral["tipo"]]
+            banda = umbral.get("banda_muerta", 0.0)
+            if banda < 0:
+                raise ValueError("La banda muerta no puede ser negativa")
+            
+            nombres.append(umbral["nombre"])
+            direcciones.append(direccion)
+            severidades.append(severidad)
+            limites.append(umbral["limite"])
+            resets.append(umbral["limite"] - direccion * banda)
+            retardos_on.append(int(umbral.get("retardo_on", 0) * 1_000_000_000))
+            retardos_off.append(int(umbral.get("retardo_off", 0) * 1_000_000_000))
+            estados.append(umbral.get("estado", "alarma"))
+        
+        self.nombres = tuple(nombres)
+        self.direcciones = tuple(direcciones)
+        self.severidades = tuple(severidades)
+        self.limites = tuple(limites)
+        self.limites_reset = tuple(resets)
+        self.retardos_on_ns = tuple(retardos_on)
+        self.retardos_off_ns = tuple(retardos_off)
+        self.estados = tuple(estados)
+        self.sin_retardos = not any(retardos_on) and not any(retardos_off)
+    
+    def __len__(self):
+        return len(self.nombres)
+
+class MotorAlarmas:
+    """
+    🚨 Estado de alarmas de UN sensor evaluado contra una TablaAlarmas
+    
+    Solo devuelve TRANSICIONES (activación / normalización), nunca la lista
+    completa: si el valor oscila dentro de la banda muerta no se generan
+    eventos nuevos.
+    
+    Cada transición es una tupla (nombre, activa, timestamp_ns, valor).
+    """
+    
+    # A partir de este tamaño de lote se usa la ruta vectorizada con NumPy
+    lote_minimo_vectorizado = 32
+    
+    def __init__(self, tabla):
+        self.tabla = tabla
+        self.activas = [False] * len(tabla)
+        self._desde = [-1] * len(tabla)   # Inicio de la condición pendiente (ns)
+    
+    def evaluar(self, valor, epoch_ns):
+        """⚡ Evalúa una lectura contra todos los umbrales"""
+        tabla = self.tabla
+        activas = self.activas
+        desde = self._desde
+        transiciones = []
+        
+        for k in range(len(activas)):
+            if tabla.direcciones[k] > 0:
+                disparo = valor > tabla.limites[k]
+                normal = valor <= tabla.limites_reset[k]
+            else:
+                disparo = valor < tabla.limites[k]
+                normal = valor >= tabla.limites_reset[k]
+            
+            # Condición que cambiaría el estado actual del umbral
+            condicion = normal if activas[k] else disparo
+            if not condicion:
+                desde[k] = -1
+                continue
+            if desde[k] < 0:
+                desde[k] = epoch_ns
+            retardo = tabla.retardos_off_ns[k] if activas[k] else tabla.retardos_on_ns[k]
+            if epoch_ns - desde[k] >= retardo:
+                activas[k] = not activas[k]
+                desde[k] = -1
+                transiciones.append((tabla.nombres[k], activas[k], epoch_ns, valor))
+        
+        return transiciones
+    
+    def evaluar_lote(self, valores, timestamps):
+        """
+        📦 Evalúa un lote de lecturas consecutivas del sensor
+        
+        Sin retardos y con NumPy disponible, la histéresis se resuelve de forma
+        vectorizada: cada umbral es un "último evento gana" (disparo o
+        normalización) que se propaga con np.maximum.accumulate.
+        """
+        if (np is None or not self.tabla.sin_retardos
+                or len(valores) < self.lote_minimo_vectorizado):
+            transiciones = []
+            for valor, epoch_ns in zip(valores, timestamps):
+                transiciones.extend(self.evaluar(valor, epoch_ns))
+            return transiciones
+        
+        tabla = self.tabla
+        v = np.asarray(valores, dtype=np.float64)
+        t = np.asarray(timestamps, dtype=np.int64)
+        posiciones = np.arange(len(v))
+        cambios = []
+        
+        for k in range(len(self.activas)):
+            if tabla.direcciones[k] > 0:
+                disparo = v > tabla.limites[k]
+                normal = v <= tabla.limites_reset[k]
+            else:
+                disparo = v < tabla.limites[k]
+                normal = v >= tabla.limites_reset[k]
+            
+            ultimo = np.where(disparo | normal, posiciones, -1)
+            np.maximum.accumulate(ultimo, out=ultimo)
+            estado = np.where(ultimo >= 0, disparo[np.maximum(ultimo, 0)], self.activas[k])
+            previo = np.concatenate(([self.activas[k]], estado[:-1]))
+            
+            for i in np.flatnonzero(estado != previo):
+                cambios.append((i, k, bool(estado[i])))
+            self.activas[k] = bool(estado[-1])
+            self._desde[k] = -1
+        
+        cambios.sort()
+        return [(tabla.nombres[k], activa, int(t[i]), float(v[i]))
+                for i, k, activa in cambios]
+    
+    def alarmas_visibles(self):
+        """
+        👁️ Alarmas a mostrar: por dirección solo la más severa activa
+        
+        (Si PRESION_CRITICA/HIHI está activa, PRESION_ALTA/HI queda oculta.)
+        """
+        tabla = self.tabla
+        mejor = {}
+        for k, activa in enumerate(self.activas):
+            if activa:
+                direccion = tabla.direcciones[k]
+                if direccion not in mejor or tabla.severidades[k] > tabla.severidades[mejor[direccion]]:
+                    mejor[direccion] = k
+        return [tabla.nombres[k] for k in sorted(mejor.values())]
+    
+    def estado_actual(self):
+        """Estado del sensor según la alarma visible de mayor prioridad"""
+        visibles = self.alarmas_visibles()
+        if not visibles:
+            return None
+        return self.tabla.estados[self.tabla.nombres.index(visibles[0])]
+
+class SensorIndustrial:
+    """
+    🏭 CLASE BASE: Funcionalidad común a todos los sensores industriales
+    
+    Esta será la clase padre de la que heredarán sensores específicos
+    """
+    
+    # Capacidad por defecto del historial circular (lecturas por sensor)
+    capacidad_historial = 1000
+    # Tamaño de la ventana deslizante de estadísticas
+    ventana_estadisticas = 60
+    # Parámetros por defecto de la tabla de alarmas (banda en unidades, retardos en s)
+    banda_muerta_alarmas = 0.0
+    retardo_activacion = 0.0
+    retardo_desactivacion = 0.0
+    
+    def __init__(self, id_sensor, ubicacion, unidad_medida, historial=None):
+        self.id_sensor = id_sensor
+        self.ubicacion = ubicacion
+        self.unidad_medida = unidad_medida
+        self.estado = "operativo"
+        # Backend de historial enchufable: circular acotado por defecto
+        self.historial = historial if historial is not None else HistorialCircular(
+            self.capacidad_historial
+        )
+        self.alarmas = []
+        # Estadísticas incrementales sobre toda la vida del sensor y la ventana
+        self.estadisticas = EstadisticasIncrementales()
+        self.estadisticas_ventana = EstadisticasVentana(self.ventana_estadisticas)
+        # Las clases hijas configuran su tabla de alarmas al conocer sus límites
+        self.motor_alarmas = None
+        # Callbacks opcionales (los instala SistemaSCADA): cambio de estado y lectura
+        self.al_cambiar_estado = None
+        self.al_registrar_lectura = None
+        
+        eventos.publicar("sensor_base_creado", id_sensor)
+    
+    def registrar_lectura(self, valor, timestamp=None):
+        """Método común para registrar lecturas"""
+        epoch_ns = self.historial.registrar(valor, timestamp)
+        self.estadisticas.agregar(valor)
+        self.estadisticas_ventana.agregar(valor)
+        self.verificar_alarmas(valor, epoch_ns)
+        if self.al_registrar_lectura is not None:
+            self.al_registrar_lectura(self, valor)
+        
+        if eventos.activo:
+            eventos.publicar("lectura", self.id_sensor, epoch_ns,
+                             valor=valor, unidad=self.unidad_medida)
+    
+    def registrar_lote(self, valores, timestamps=None):
+        """
+        📦 Registra varias lecturas y evalúa sus alarmas en un solo paso
+        
+        Args:
+            valores: Lecturas en orden cronológico
+            timestamps: Timestamps de cada lectura (por defecto, uno común)
+        
+        Returns:
+            list: Transiciones de alarma producidas por el lote
+        """
+        if timestamps is None:
+            timestamps = [reloj.ahora_ns()] * len(valores)
+        timestamps = [self.historial.registrar(valor, marca)
+                      for valor, marca in zip(valores, timestamps)]
+        for valor in valores:
+            self.estadisticas.agregar(valor)
+            self.estadisticas_ventana.agregar(valor)
+        
+        transiciones = []
+        if self.motor_alarmas is not None:
+            transiciones = self.motor_alarmas.evaluar_lote(valores, timestamps)
+            if transiciones:
+                visibles_antes = list(self.alarmas)
+                self._aplicar_transiciones()
+                self._publicar_transiciones(visibles_antes, transiciones)
+        if self.al_registrar_lectura is not None and len(valores):
+            self.al_registrar_lectura(self, valores[-1])
+        return transiciones
+    
+    def construir_tabla_alarmas(self):
+        """Tabla de umbrales del sensor - será sobrescrito por clases hijas"""
+        return None
+    
+    def configurar_alarmas(self, tabla):
+        """🔧 Instala (o reemplaza) la tabla de alarmas del sensor"""
+        self.motor_alarmas = MotorAlarmas(tabla) if tabla is not None else None
+    
+    def verificar_alarmas(self, valor, timestamp=None):
+        """
+        🚨 Evalúa la lectura con el motor de alarmas por tabla
+        
+        Solo modifica self.alarmas y self.estado cuando hay transiciones.
+        
+        Returns:
+            list: Transiciones (nombre, activa, timestamp_ns, valor)
+        """
+        if self.motor_alarmas is None:
+            return []
+        transiciones = self.motor_alarmas.evaluar(valor, a_epoch_ns(timestamp))
+        if transiciones:
+            visibles_antes = list(self.alarmas)
+            self._aplicar_transiciones()
+            self._publicar_transiciones(visibles_antes, transiciones)
+        return transiciones
+    
+    def _publicar_transiciones(self, visibles_antes, transiciones):
+        """
+        Publica como eventos los cambios de las alarmas VISIBLES
+        
+        Así consola, diario y contadores coinciden con self.alarmas: si
+        PRESION_CRITICA se activa, PRESION_ALTA (oculta) no genera evento;
+        si CRITICA se normaliza y ALTA sigue activa, ALTA vuelve a aparecer.
+        """
+        if not eventos.activo:
+            return
+        antes = set(visibles_antes)
+        despues = set(self.alarmas)
+        if antes == despues:
+            return
+        # Marca y valor de la última transición de cada alarma (o del lote)
+        marcas = {nombre: (epoch_ns, valor) for nombre, _, epoch_ns, valor in transiciones}
+        ultima = transiciones[-1][2:]
+        for nombre in visibles_antes:
+            if nombre not in despues:
+                epoch_ns, valor = marcas.get(nombre, ultima)
+                eventos.publicar("alarma", self.id_sensor, epoch_ns, alarma=nombre,
+                                 accion="NORMALIZADA", valor=valor)
+        for nombre in self.alarmas:
+            if nombre not in antes:
+                epoch_ns, valor = marcas.get(nombre, ultima)
+                eventos.publicar("alarma", self.id_sensor, epoch_ns, alarma=nombre,
+                                 accion="ACTIVADA", valor=valor)
+    
+    def _aplicar_transiciones(self):
+        """Sincroniza self.alarmas / self.estado con el motor de alarmas"""
+        self.alarmas[:] = self.motor_alarmas.alarmas_visibles()
+        self.estado = self.motor_alarmas.estado_actual() or "operativo"
+        if self.al_cambiar_estado is not None:
+            self.al_cambiar_estado(self)
+    
+    def obtener_ultima_lectura(self):
+        """Obtener la lectura más reciente"""
+        return self.historial.ultima()
+    
+    @property
+    def total_lecturas(self):
+        """Total de lecturas registradas (incluye las ya desalojadas del historial)"""
+        return self.historial.total_registrado
+    
+    @property
+    def nombre_tipo(self):
+        """Nombre del tipo de sensor (para exportaciones JSON)"""
+        return type(self).__name__
+    
+    def generar_reporte_base(self):
+        """Generar reporte básico común a todos los sensores"""
+        print(f"\n📋 REPORTE SENSOR {self.id_sensor}")
+        print(f"📍 Ubicación: {self.ubicacion}")
+        print(f"📊 Estado: {self.estado}")
+        print(f"📈 Total lecturas: {len(self.historial)}")
+        
+        if self.alarmas:
+            print(f"🚨 Alarmas: {', '.join(self.alarmas)}")
+
+class SensorTemperaturaAvanzado(SensorIndustrial):
+    """
+    🌡️ CLASE HIJA: Sensor de temperatura con funcionalidades específicas
+    
+    HEREDA de SensorIndustrial y AÑADE funcionalidad específica
+    """
+    
+    def __init__(self, id_sensor, ubicacion, limite_min=-10, limite_max=100, historial=None):
+        # Llamar al constructor de la clase padre
+        super().__init__(id_sensor, ubicacion, "°C", historial)
+        
+        # Atributos específicos de temperatura
+        self.limite_min = limite_min
+        self.limite_max = limite_max
+        self.tipo_sensor = "Temperatura"
+        self.configurar_alarmas(self.construir_tabla_alarmas())
+        
+        eventos.publicar("sensor_temperatura_creado", id_sensor,
+                         limite_min=limite_min, limite_max=limite_max)
+    
+    def construir_tabla_alarmas(self):
+        """
+        SOBRESCRIBIR método padre con los umbrales específicos de temperatura
+        """
+        comun = {"banda_muerta": self.banda_muerta_alarmas,
+                 "retardo_on": self.retardo_activacion,
+                 "retardo_off": self.retardo_desactivacion}
+        return TablaAlarmas([
+            {"nombre": "TEMPERATURA_ALTA", "tipo": "HI", "limite": self.limite_max,
+             "estado": "alarma_alta", **comun},
+            {"nombre": "TEMPERATURA_BAJA", "tipo": "LO", "limite": self.limite_min,
+             "estado": "alarma_baja", **comun},
+        ])
+    
+    def calcular_eficiencia_termica(self):
+        """
+        MÉTODO ESPECÍFICO: Solo los sensores de temperatura lo tienen
+        
+        Usa las estadísticas incrementales: costo constante.
+        """
+        stats = self.estadisticas
+        if stats.cantidad < 2:
+            return None
+        
+        # Calcular estabilidad térmica
+        variacion = stats.maximo - stats.minimo
+        
+        # Eficiencia basada en estabilidad (menos variación = más eficiente)
+        eficiencia = max(0, 100 - (variacion * 2))
+        
+        return {
+            "eficiencia_termica": eficiencia,
+            "variacion_maxima": variacion,
+            "temperatura_promedio": stats.media,
+            "desviacion_estandar": stats.desviacion,
+            "variacion_ventana": self.estadisticas_ventana.maximo - self.estadisticas_ventana.minimo
+        }
+    
+    def generar_reporte(self):
+        """
+        EXTENDER funcionalidad del método padre
+        """
+        # Llamar al reporte base del padre
+        self.generar_reporte_base()
+        
+        # Agregar información específica de temperatura
+        print(f"🌡️ Tipo: {self.tipo_sensor}")
+        print(f"🔥 Límite máximo: {self.limite_max}°C")
+        print(f"❄️ Límite mínimo: {self.limite_min}°C")
+        
+        eficiencia = self.calcular_eficiencia_termica()
+        if eficiencia:
+            print(f"⚡ Eficiencia térmica: {eficiencia['eficiencia_termica']:.1f}%")
+            print(f"📊 Temp. promedio: {eficiencia['temperatura_promedio']:.1f}°C")
+
+class SensorPresion(SensorIndustrial):
+    """
+    💨 CLASE HIJA: Sensor de presión con funcionalidades específicas
+    """
+    
+    def __init__(self, id_sensor, ubicacion, presion_maxima=10.0, historial=None):
+        super().__init__(id_sensor, ubicacion, "bar", historial)
+        
+        self.presion_maxima = presion_maxima
         self.tipo_sensor = "Presión"
         self.presion_critica = presion_maxima * 0.9  # 90% de la máxima
+        self.configurar_alarmas(self.construir_tabla_alarmas())
         
-        print(f"💨 Sensor de presión especializado creado")
-        print(f"   Presión máxima: {presion_maxima} bar")
-    
-    def verificar_alarmas(self, presion):
-        """Verificar alarmas específicas de presión"""
-        self.alarmas.clear()
-        
-        if presion > self.presion_maxima:
-            self.alarmas.append("PRESION_CRITICA")
-            self.estado = "emergencia"
-        elif presion > self.presion_critica:
-            self.alarmas.append("PRESION_ALTA")
-            self.estado = "advertencia"
-        elif presion < 0:
-            self.alarmas.append("PRESION_NEGATIVA")
-            self.estado = "error"
-        else:
-            self.estado = "operativo"
+        eventos.publicar("sensor_presion_creado", id_sensor, presion_maxima=presion_maxima)
+    
+    def construir_tabla_alarmas(self):
+        """Umbrales específicos de presión (HIHI → HI → LO por prioridad)"""
+        comun = {"banda_muerta": self.banda_muerta_alarmas,
+                 "retardo_on": self.retardo_activacion,
+                 "retardo_off": self.retardo_desactivacion}
+        return TablaAlarmas([
+            {"nombre": "PRESION_CRITICA", "tipo": "HIHI", "limite": self.presion_maxima,
+             "estado": "emergencia", **comun},
+            {"nombre": "PRESION_ALTA", "tipo": "HI", "limite": self.presion_critica,
+             "estado": "advertencia", **comun},
+            {"nombre": "PRESION_NEGATIVA", "tipo": "LO", "limite": 0.0,
+             "estado": "error", **comun},
+        ])
     
     def calcular_factor_seguridad(self):
         """Método específico para calcular factor de seguridad"""
-        if not self.historial:
+        ultima = self.historial.ultima()
+        if ultima is None:
             return None
         
-        ultima_presion = self.historial[-1][1]
+        ultima_presion = ultima[1]
         factor = self.presion_maxima / ultima_presion if ultima_presion > 0 else float('inf')
         
         return {
@@ -667,12 +1799,16 @@ class DispositivoIoT:
         self.id_dispositivo = id_dispositivo
         self.tipo = tipo
         self.valor = valor_inicial
-        self.timestamp_creacion = self._obtener_timestamp()
+        self._creacion_ns = reloj.ahora_ns()
+    
+    @property
+    def timestamp_creacion(self):
+        """Timestamp de creación, formateado solo cuando se consulta"""
+        return formatear_timestamp(self._creacion_ns)
     
     def _obtener_timestamp(self):
         """Método auxiliar para obtener timestamp"""
-        from datetime import datetime
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return formatear_timestamp(reloj.ahora_ns())
     
     def __str__(self):
         """
@@ -690,15 +1826,15 @@ class DispositivoIoT:
         """
         ⚖️ Comparación de igualdad (==)
         """
-        if not isinstance(otro, DispositivoIoT):
-            return False
+        if not isinstance(otro, (DispositivoIoT, DispositivoIoTCompacto)):
+            return NotImplemented
         return self.id_dispositivo == otro.id_dispositivo
     
     def __lt__(self, otro):
         """
         📊 Comparación menor que (<) para ordenamiento
         """
-        if not isinstance(otro, DispositivoIoT):
+        if not isinstance(otro, (DispositivoIoT, DispositivoIoTCompacto)):
             return NotImplemented
         return self.valor < otro.valor
     
@@ -706,7 +1842,7 @@ class DispositivoIoT:
         """
         ➕ Operador suma para combinar valores
         """
-        if isinstance(otro, DispositivoIoT):
+        if isinstance(otro, (DispositivoIoT, DispositivoIoTCompacto)):
             return self.valor + otro.valor
         elif isinstance(otro, (int, float)):
             return self.valor + otro
@@ -791,6 +1927,12 @@ def paso_6_metodos_especiales():
     for dispositivo in dispositivos_ordenados:
         print(f"  {dispositivo}")
     
+    # Para "los N mayores" no hace falta ordenar todo: índice top-k incremental
+    indice = IndiceTopK()
+    for dispositivo in dispositivos:
+        indice.actualizar(dispositivo.id_dispositivo, dispositivo.valor)
+    print(f"🔥 Top 2 por valor: {indice.top(2)}")
+    
     # __add__ en acción
     print(f"\n➕ OPERACIONES MATEMÁTICAS:")
     suma_sensores = sensor_temp + sensor_hum
@@ -802,153 +1944,1710 @@ def paso_6_metodos_especiales():
 # PASO 7: PROYECTO INTEGRADOR - SISTEMA SCADA BÁSICO
 # ═══════════════════════════════════════════════════════════════════════════════
 
-class SistemaSCADA:
+# ═══════════════════════════════════════════════════════════════════════════════
+# HERRAMIENTA: BANCO DE SENSORES COLUMNAR (NumPy) PARA PLANTAS GRANDES
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class BancoSensores:
     """
-    🏭 PROYECTO INTEGRADOR: Sistema SCADA que demuestra todos los conceptos POO
+    🗄️ Almacenamiento columnar de TODOS los sensores de la planta
     
-    Este sistema simula un SCADA real que:
-    - Gestiona múltiples tipos de dispositivos
-    - Procesa datos en tiempo real
-    - Genera reportes y alarmas
-    - Prepara datos para APIs (Flask) y bases de datos (SQL)
+    En lugar de un objeto por sensor, guarda cada atributo en un array NumPy
+    (límites, valor actual, código de estado/alarma, contador de lecturas).
+    Un escaneo completo son unas pocas operaciones vectorizadas, sin bucles
+    Python ni isinstance por dispositivo: apto para 100k+ dispositivos.
+    
+    💡 ANALOGÍA INDUSTRIAL: Es la "tabla de tags" de un PLC: una columna por
+    propiedad, una fila por tag.
     """
     
-    def __init__(self, nombre_planta):
-        self.nombre_planta = nombre_planta
-        self.dispositivos = {}
-        self.historial_eventos = []
-        self.alarmas_activas = []
-        self.estado_sistema = "iniciando"
+    TIPO_TEMPERATURA = 0
+    TIPO_PRESION = 1
+    
+    # Código de alarma → (nombre de alarma, estado del sensor); 0 = sin alarma
+    ALARMAS = ("", "TEMPERATURA_ALTA", "TEMPERATURA_BAJA",
+               "PRESION_CRITICA", "PRESION_ALTA", "PRESION_NEGATIVA")
+    ESTADOS = ("operativo", "alarma_alta", "alarma_baja",
+               "emergencia", "advertencia", "error")
+    
+    def __init__(self, capacidad_inicial=1024, semilla=None):
+        if np is None:
+            raise ImportError("BancoSensores requiere NumPy: pip install numpy")
         
-        print(f"🏭 Sistema SCADA '{nombre_planta}' inicializado")
+        self.cantidad = 0
+        self.ids = []
+        self.ubicaciones = []
+        self.unidades = []
+        self.tipos_nombre = []
+        self.indices = {}          # id_sensor → fila
+        self.operativos = 0
+        self._cambiadas = []       # Filas cuyo código de alarma cambió
+        self.rng = np.random.default_rng(semilla)
+        self._reservar(capacidad_inicial)
     
-    def registrar_dispositivo(self, dispositivo):
-        """Registrar un nuevo dispositivo en el sistema"""
-        self.dispositivos[dispositivo.id_sensor] = dispositivo
-        evento = f"Dispositivo {dispositivo.id_sensor} registrado"
-        self.historial_eventos.append(evento)
-        print(f"✅ {evento}")
+    # Columnas del banco y su tipo (código de array: se mapea a dtype NumPy)
+    COLUMNAS = {
+        "tipo": "b", "limite_min": "d", "limite_max": "d", "limite_critico": "d",
+        "base_sim": "d", "amplitud_sim": "d", "valor": "d",
+        "codigo": "b", "total": "q", "marca_ns": "q"
+    }
     
-    def escanear_dispositivos(self):
-        """Escanear todos los dispositivos y actualizar estados"""
-        import random
+    def _reservar(self, capacidad):
+        """Crea (o agranda) las columnas conservando los datos existentes"""
+        for nombre, dtype in self.COLUMNAS.items():
+            nueva = np.zeros(capacidad, dtype=dtype)
+            if self.cantidad:
+                nueva[:self.cantidad] = getattr(self, nombre)[:self.cantidad]
+            setattr(self, nombre, nueva)
+        self.capacidad = capacidad
+    
+    def agregar(self, sensor):
+        """
+        ➕ Copia la configuración de un sensor al banco
         
-        print(f"🔄 Escaneando {len(self.dispositivos)} dispositivos...")
+        Returns:
+            VistaSensorBanco: Vista ligera compatible con la API por objeto
+        """
+        if self.cantidad == self.capacidad:
+            self._reservar(self.capacidad * 2)   # Crecimiento amortizado O(1)
         
-        for id_dispositivo, dispositivo in self.dispositivos.items():
-            # Simular lectura según tipo de dispositivo
-            if isinstance(dispositivo, SensorTemperaturaAvanzado):
-                # Temperatura aleatoria dentro de rangos
-                rango = dispositivo.limite_max - dispositivo.limite_min
-                valor = dispositivo.limite_min + random.uniform(0, rango * 1.2)
-                dispositivo.registrar_lectura(valor)
-                
-            elif isinstance(dispositivo, SensorPresion):
-                # Presión aleatoria
-                valor = random.uniform(0, dispositivo.presion_maxima * 1.1)
-                dispositivo.registrar_lectura(valor)
+        i = self.cantidad
+        if isinstance(sensor, SensorTemperaturaAvanzado):
+            self.tipo[i] = self.TIPO_TEMPERATURA
+            self.limite_min[i] = sensor.limite_min
+            self.limite_max[i] = sensor.limite_max
+            self.limite_critico[i] = sensor.limite_max
+            self.base_sim[i] = sensor.limite_min
+            self.amplitud_sim[i] = (sensor.limite_max - sensor.limite_min) * 1.2
+        elif isinstance(sensor, SensorPresion):
+            self.tipo[i] = self.TIPO_PRESION
+            self.limite_min[i] = 0.0
+            self.limite_max[i] = sensor.presion_maxima
+            self.limite_critico[i] = sensor.presion_critica
+            self.base_sim[i] = 0.0
+            self.amplitud_sim[i] = sensor.presion_maxima * 1.1
+        else:
+            raise TypeError(f"Tipo de sensor no soportado en banco: {type(sensor).__name__}")
         
-        self._actualizar_alarmas()
+        self.ids.append(sensor.id_sensor)
+        self.ubicaciones.append(sensor.ubicacion)
+        self.unidades.append(sensor.unidad_medida)
+        self.tipos_nombre.append(type(sensor).__name__)
+        self.indices[sensor.id_sensor] = i
+        self.operativos += 1
+        self.cantidad += 1
+        return VistaSensorBanco(self, i)
     
-    def _actualizar_alarmas(self):
-        """Actualizar lista de alarmas del sistema"""
-        self.alarmas_activas.clear()
+    def registrar_lecturas(self, valores, timestamp=None, validas=None):
+        """
+        📥 Registra un vector de lecturas (una por sensor) y evalúa alarmas
         
-        for id_dispositivo, dispositivo in self.dispositivos.items():
-            if dispositivo.alarmas:
-                for alarma in dispositivo.alarmas:
-                    self.alarmas_activas.append({
-                        'dispositivo': id_dispositivo,
-                        'tipo_alarma': alarma,
-                        'ubicacion': dispositivo.ubicacion,
-                        'estado': dispositivo.estado
-                    })
+        Args:
+            valores: Array con self.cantidad lecturas, en orden de fila
+            timestamp: Marca común del ciclo de escaneo
+            validas: Máscara booleana opcional; las filas en False conservan
+                su lectura anterior (p. ej. lecturas perdidas)
+        """
+        n = self.cantidad
+        if validas is None:
+            self.valor[:n] = valores
+            self.total[:n] += 1
+            self.marca_ns[:n] = a_epoch_ns(timestamp)
+        else:
+            self.valor[:n][validas] = np.asarray(valores)[validas]
+            self.total[:n][validas] += 1
+            self.marca_ns[:n][validas] = a_epoch_ns(timestamp)
+        self._evaluar_alarmas()
     
-    def generar_reporte_ejecutivo(self):
-        """Generar reporte completo del sistema"""
-        print(f"\n🏭 REPORTE EJECUTIVO - {self.nombre_planta}")
-        print(f"{'='*70}")
-        
-        # Estadísticas generales
-        total_dispositivos = len(self.dispositivos)
-        dispositivos_operativos = sum(1 for d in self.dispositivos.values() 
-                                    if d.estado == "operativo")
+    def escanear(self, timestamp=None):
+        """🔄 Simula un ciclo de escaneo completo (valores aleatorios vectorizados)"""
+        n = self.cantidad
+        valores = self.base_sim[:n] + self.rng.random(n) * self.amplitud_sim[:n]
+        self.registrar_lecturas(valores, timestamp)
+    
+    def _evaluar_alarmas(self):
+        """
+        🚨 Evalúa las alarmas de todo el banco en una sola pasada vectorizada
         
-        print(f"📊 RESUMEN GENERAL:")
-        print(f"   🔧 Total dispositivos: {total_dispositivos}")
-        print(f"   ✅ Dispositivos operativos: {dispositivos_operativos}")
-        print(f"   🚨 Alarmas activas: {len(self.alarmas_activas)}")
-        print(f"   📈 Disponibilidad: {(dispositivos_operativos/total_dispositivos*100):.1f}%")
+        Equivale a la tabla de alarmas de las clases con sus parámetros por
+        defecto (banda muerta y retardos en 0): sin histéresis ni retardos.
+        Los sensores que los necesiten deben usar el modo de objetos.
+        """
+        n = self.cantidad
+        valor = self.valor[:n]
+        es_temp = self.tipo[:n] == self.TIPO_TEMPERATURA
+        es_pres = ~es_temp
+        alto = valor > self.limite_max[:n]
+        bajo = valor < self.limite_min[:n]
         
-        # Detalle de alarmas
-        if self.alarmas_activas:
-            print(f"\n🚨 ALARMAS ACTIVAS:")
-            for alarma in self.alarmas_activas:
-                print(f"   ⚠️ {alarma['dispositivo']}: {alarma['tipo_alarma']}")
-                print(f"      📍 {alarma['ubicacion']} | Estado: {alarma['estado']}")
-        else:
-            print(f"\n✅ Sin alarmas activas - Sistema operando normalmente")
+        anterior = self.codigo[:n].copy()
+        # Mismo orden de prioridad que los if/elif de cada clase
+        self.codigo[:n] = np.select(
+            [es_temp & alto, es_temp & bajo,
+             es_pres & alto, es_pres & (valor > self.limite_critico[:n]), es_pres & bajo],
+            [1, 2, 3, 4, 5],
+            default=0
+        )
+        self.operativos = int(np.count_nonzero(self.codigo[:n] == 0))
         
-        # Detalle por zonas
-        zonas = {}
-        for dispositivo in self.dispositivos.values():
-            zona = dispositivo.ubicacion
-            if zona not in zonas:
-                zonas[zona] = {'dispositivos': 0, 'operativos': 0, 'alarmas': 0}
-            
-            zonas[zona]['dispositivos'] += 1
-            if dispositivo.estado == "operativo":
-                zonas[zona]['operativos'] += 1
-            if dispositivo.alarmas:
-                zonas[zona]['alarmas'] += len(dispositivo.alarmas)
+        cambiadas = np.flatnonzero(self.codigo[:n] != anterior)
+        if cambiadas.size:
+            self._cambiadas.append(cambiadas)
+    
+    def congelar(self):
+        """
+        🧊 Copia de solo lectura del estado dinámico (para instantáneas)
         
-        print(f"\n📍 ESTADO POR ZONAS:")
-        for zona, stats in zonas.items():
-            disponibilidad = (stats['operativos'] / stats['dispositivos'] * 100)
-            print(f"   🏭 {zona}:")
-            print(f"      📊 {stats['dispositivos']} dispositivos | "
-                  f"✅ {stats['operativos']} operativos | "
-                  f"🚨 {stats['alarmas']} alarmas | "
-                  f"📈 {disponibilidad:.1f}% disponibilidad")
+        Las columnas que cambian en cada escaneo se copian; las listas de
+        metadatos solo crecen por el final, así que basta con compartirlas
+        y recordar cuántas filas había.
+        """
+        n = self.cantidad
+        congelado = object.__new__(BancoSensores)
+        congelado.cantidad = n
+        congelado.ids = self.ids
+        congelado.ubicaciones = self.ubicaciones
+        congelado.unidades = self.unidades
+        congelado.tipos_nombre = self.tipos_nombre
+        for nombre in ("codigo", "valor", "total", "marca_ns"):
+            setattr(congelado, nombre, getattr(self, nombre)[:n].copy())
+        return congelado
     
-    def exportar_datos_json(self):
-        """Preparar datos para API Flask (formato JSON)"""
-        datos_exportacion = {
-            'planta': self.nombre_planta,
-            'timestamp': self._obtener_timestamp(),
-            'dispositivos': [],
-            'alarmas': self.alarmas_activas,
-            'resumen': {
-                'total_dispositivos': len(self.dispositivos),
-                'dispositivos_operativos': sum(1 for d in self.dispositivos.values() 
-                                             if d.estado == "operativo"),
-                'total_alarmas': len(self.alarmas_activas)
-            }
-        }
+    def tomar_cambios(self):
+        """🔁 Devuelve (y olvida) las filas que cambiaron de estado desde la última llamada"""
+        if not self._cambiadas:
+            return []
+        cambiadas = np.unique(np.concatenate(self._cambiadas))
+        self._cambiadas.clear()
+        return [int(i) for i in cambiadas]
+    
+    def indices_en_alarma(self):
+        """Filas con alguna alarma activa"""
+        return np.flatnonzero(self.codigo[:self.cantidad])
+    
+    # Severidad de cada código de alarma (misma escala que TablaAlarmas.TIPOS)
+    SEVERIDADES = (0, 1, 1, 2, 1, 1)
+    
+    def puntajes(self, criterio="desviacion"):
+        """📐 Puntaje vectorizado de cada fila para los criterios de CRITERIOS_TOP"""
+        n = self.cantidad
+        valor = self.valor[:n]
+        if criterio == "valor":
+            return valor.copy()
+        alto = self.limite_max[:n]
+        bajo = self.limite_min[:n]
+        desviacion = np.maximum((valor - alto) / np.maximum(np.abs(alto), 1.0),
+                                (bajo - valor) / np.maximum(np.abs(bajo), 1.0))
+        if criterio == "desviacion":
+            return desviacion
+        if criterio == "severidad":
+            severidad = np.asarray(self.SEVERIDADES, dtype=np.float64)[self.codigo[:n]]
+            return severidad + (1.0 + desviacion / (1.0 + np.abs(desviacion))) / 2.0
+        raise ValueError(f"Criterio desconocido: {criterio}")
+    
+    def top(self, k=10, criterio="desviacion"):
+        """
+        🔥 Los k sensores con mayor puntaje (solo filas ya leídas)
         
-        for id_dispositivo, dispositivo in self.dispositivos.items():
-            ultima_lectura = dispositivo.obtener_ultima_lectura()
-            datos_exportacion['dispositivos'].append({
-                'id': id_dispositivo,
-                'tipo': type(dispositivo).__name__,
-                'ubicacion': dispositivo.ubicacion,
-                'estado': dispositivo.estado,
-                'unidad_medida': dispositivo.unidad_medida,
-                'ultima_lectura': {
-                    'timestamp': ultima_lectura[0] if ultima_lectura else None,
-                    'valor': ultima_lectura[1] if ultima_lectura else None
-                },
-                'total_lecturas': len(dispositivo.historial)
-            })
-        
-        return datos_exportacion
+        np.argpartition selecciona los k mejores en O(n) y solo esos k se
+        ordenan: nunca se ordena la planta completa.
+        """
+        puntaje = self.puntajes(criterio)
+        puntaje[self.total[:self.cantidad] == 0] = -np.inf
+        k = min(k, self.cantidad)
+        if k <= 0:
+            return []
+        candidatos = np.argpartition(-puntaje, k - 1)[:k]
+        orden = candidatos[np.argsort(-puntaje[candidatos], kind="stable")]
+        return [(self.ids[i], float(puntaje[i])) for i in orden if puntaje[i] > -np.inf]
     
-    def _obtener_timestamp(self):
-        """Obtener timestamp actual"""
-        from datetime import datetime
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def registrar_lectura(self, indice, valor, timestamp=None):
+        """Escritura de un solo sensor (compatibilidad con la API por objeto)"""
+        anterior = int(self.codigo[indice])
+        self.valor[indice] = valor
+        self.total[indice] += 1
+        self.marca_ns[indice] = a_epoch_ns(timestamp)
+        
+        if self.tipo[indice] == self.TIPO_TEMPERATURA:
+            codigo = 1 if valor > self.limite_max[indice] else 2 if valor < self.limite_min[indice] else 0
+        else:
+            codigo = (3 if valor > self.limite_max[indice] else
+                      4 if valor > self.limite_critico[indice] else
+                      5 if valor < self.limite_min[indice] else 0)
+        self.codigo[indice] = codigo
+        self.operativos += (anterior != 0) - (codigo != 0)
+        if codigo != anterior:
+            self._cambiadas.append(np.array([indice]))
 
-def paso_7_proyecto_integrador():
+class VistaSensorBanco:
+    """
+    🔍 Vista ligera de una fila del BancoSensores
+    
+    Ofrece los mismos atributos que usa SistemaSCADA (id_sensor, ubicacion,
+    estado, alarmas, obtener_ultima_lectura...) leyendo directamente de las
+    columnas del banco. No duplica datos.
+    """
+    
+    def __init__(self, banco, indice):
+        self.banco = banco
+        self.indice = indice
+    
+    @property
+    def id_sensor(self):
+        return self.banco.ids[self.indice]
+    
+    @property
+    def ubicacion(self):
+        return self.banco.ubicaciones[self.indice]
+    
+    @property
+    def unidad_medida(self):
+        return self.banco.unidades[self.indice]
+    
+    @property
+    def nombre_tipo(self):
+        return self.banco.tipos_nombre[self.indice]
+    
+    @property
+    def estado(self):
+        return self.banco.ESTADOS[self.banco.codigo[self.indice]]
+    
+    @property
+    def alarmas(self):
+        codigo = self.banco.codigo[self.indice]
+        return [self.banco.ALARMAS[codigo]] if codigo else []
+    
+    @property
+    def valor_actual(self):
+        return float(self.banco.valor[self.indice])
+    
+    @property
+    def total_lecturas(self):
+        return int(self.banco.total[self.indice])
+    
+    def registrar_lectura(self, valor, timestamp=None):
+        self.banco.registrar_lectura(self.indice, valor, timestamp)
+    
+    def obtener_ultima_lectura(self):
+        if not self.banco.total[self.indice]:
+            return None
+        return (formatear_timestamp(int(self.banco.marca_ns[self.indice])), self.valor_actual)
+
+def puntaje_valor(dispositivo, valor):
+    """Criterio 'valor': la lectura tal cual (los más altos primero)"""
+    return float(valor)
+
+def puntaje_desviacion(dispositivo, valor):
+    """
+    Criterio 'desviacion': exceso relativo sobre el umbral más cercano
+    
+    Positivo = fuera de límites, negativo = margen que queda hasta el límite.
+    Usa la tabla de alarmas del sensor; sin tabla el sensor queda al final.
+    """
+    motor = dispositivo.motor_alarmas
+    if motor is None:
+        return float("-inf")
+    tabla = motor.tabla
+    return max(direccion * (valor - limite) / max(abs(limite), 1.0)
+               for direccion, limite in zip(tabla.direcciones, tabla.limites))
+
+def puntaje_severidad(dispositivo, valor):
+    """
+    Criterio 'severidad': severidad de la peor alarma activa (0, 1 o 2)
+    
+    La parte decimal (entre 0 y 1) desempata por desviación.
+    """
+    desviacion = puntaje_desviacion(dispositivo, valor)
+    if desviacion == float("-inf"):
+        return desviacion
+    motor = dispositivo.motor_alarmas
+    severidad = max((motor.tabla.severidades[k] for k, activa in enumerate(motor.activas)
+                     if activa), default=0)
+    return severidad + (1.0 + desviacion / (1.0 + abs(desviacion))) / 2.0
+
+CRITERIOS_TOP = {
+    "valor": puntaje_valor,
+    "desviacion": puntaje_desviacion,
+    "severidad": puntaje_severidad,
+}
+
+class IndiceTopK:
+    """
+    🔥 Índice incremental de los "N sensores más calientes"
+    
+    Montículo (heapq) de máximos con INVALIDACIÓN PEREZOSA: cada lectura
+    empuja una entrada nueva con su versión y las viejas quedan como basura
+    que se descarta al consultarlas. Actualizar cuesta O(log n) y pedir el
+    top-k cuesta O(k log n), sin ordenar nunca la planta completa.
+    """
+    
+    # Se reconstruye el montículo cuando la basura supera este factor
+    factor_compactacion = 2
+    
+    def __init__(self):
+        self._monticulo = []      # (-puntaje, versión, clave)
+        self._vigentes = {}       # clave → (puntaje, versión)
+        self._version = 0
+    
+    def actualizar(self, clave, puntaje):
+        """
+        ⚡ Registra el puntaje actual de una clave
+        
+        Un puntaje NaN (lectura perdida) saca la clave del ranking: NaN rompe
+        el orden del montículo y nunca es igual a sí mismo.
+        """
+        if puntaje != puntaje:
+            self.eliminar(clave)
+            return
+        actual = self._vigentes.get(clave)
+        if actual is not None and actual[0] == puntaje:
+            return
+        self._version += 1
+        self._vigentes[clave] = (puntaje, self._version)
+        heapq.heappush(self._monticulo, (-puntaje, self._version, clave))
+        if len(self._monticulo) > self.factor_compactacion * len(self._vigentes) + 64:
+            self._compactar()
+    
+    def eliminar(self, clave):
+        """Saca una clave del índice (su entrada se descarta de forma perezosa)"""
+        self._vigentes.pop(clave, None)
+    
+    def top(self, k=10):
+        """
+        🏆 Las k claves de mayor puntaje, de mayor a menor
+        
+        Returns:
+            list: Tuplas (clave, puntaje)
+        """
+        monticulo, vigentes = self._monticulo, self._vigentes
+        resultado, extraidas = [], []
+        while monticulo and len(resultado) < k:
+            entrada = heapq.heappop(monticulo)
+            negativo, version, clave = entrada
+            actual = vigentes.get(clave)
+            if actual is None or actual[1] != version:
+                continue   # Entrada obsoleta: se descarta para siempre
+            extraidas.append(entrada)
+            resultado.append((clave, -negativo))
+        for entrada in extraidas:
+            heapq.heappush(monticulo, entrada)
+        return resultado
+    
+    def _compactar(self):
+        """🧹 Reconstruye el montículo solo con las entradas vigentes"""
+        self._monticulo = [(-puntaje, version, clave)
+                           for clave, (puntaje, version) in self._vigentes.items()]
+        heapq.heapify(self._monticulo)
+    
+    def __len__(self):
+        return len(self._vigentes)
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HERRAMIENTA: SIMULADOR VECTORIZADO DE SEÑALES (PRUEBAS DE CARGA)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class SimuladorSenales:
+    """
+    📈 Genera las señales de TODA la planta en cada tick con NumPy
+    
+    Una fila por tag; cada componente es una columna de parámetros:
+    
+    - base + deriva (unidades/s) + escalones aleatorios → nivel del proceso
+    - seno (amplitud, período, fase) → ciclos de operación
+    - ruido gaussiano → ruido de medición
+    - congelado: el tag queda "pegado" en su último valor un tiempo
+    - pérdida: la lectura de ese tick no llega (NaN)
+    
+    Con la misma semilla la secuencia es idéntica: las pruebas de carga de
+    100k tags se repiten exactamente.
+    """
+    
+    # Parámetro → valor por defecto (cada uno es una columna float64)
+    PARAMETROS = {
+        "base": 0.0, "ruido": 0.0, "deriva": 0.0,
+        "amplitud_seno": 0.0, "periodo_s": 60.0, "fase": 0.0,
+        "prob_escalon": 0.0, "tamano_escalon": 0.0,
+        "prob_congelado": 0.0, "duracion_congelado_s": 10.0,
+        "prob_perdida": 0.0,
+    }
+    
+    def __init__(self, semilla=None, capacidad_inicial=1024):
+        if np is None:
+            raise ImportError("SimuladorSenales requiere NumPy: pip install numpy")
+        self.rng = np.random.default_rng(semilla)
+        self.cantidad = 0
+        self.tiempo_s = 0.0
+        self.capacidad = 0
+        self._reservar(capacidad_inicial)
+    
+    def _reservar(self, capacidad):
+        """Crea (o agranda) las columnas de parámetros y de estado"""
+        for nombre in (*self.PARAMETROS, "nivel", "ultimo", "congelado_hasta"):
+            nueva = np.zeros(capacidad, dtype=np.float64)
+            if self.cantidad:
+                nueva[:self.cantidad] = getattr(self, nombre)[:self.cantidad]
+            setattr(self, nombre, nueva)
+        self.capacidad = capacidad
+    
+    def agregar(self, cantidad=1, **parametros):
+        """
+        ➕ Agrega `cantidad` tags con los mismos parámetros (o arrays por tag)
+        
+        Args:
+            cantidad (int): Tags a agregar
+            **parametros: Claves de PARAMETROS; escalares o arrays de largo `cantidad`
+        
+        Returns:
+            range: Filas asignadas a los tags nuevos
+        """
+        desconocidos = set(parametros) - set(self.PARAMETROS)
+        if desconocidos:
+            raise ValueError(f"Parámetros de simulación desconocidos: {sorted(desconocidos)}")
+        
+        inicio, fin = self.cantidad, self.cantidad + cantidad
+        if fin > self.capacidad:
+            self._reservar(max(fin, self.capacidad * 2))
+        for nombre, defecto in self.PARAMETROS.items():
+            getattr(self, nombre)[inicio:fin] = parametros.get(nombre, defecto)
+        self.nivel[inicio:fin] = self.base[inicio:fin]
+        self.ultimo[inicio:fin] = self.base[inicio:fin]
+        self.congelado_hasta[inicio:fin] = -np.inf
+        self.cantidad = fin
+        return range(inicio, fin)
+    
+    def tick(self, dt=1.0):
+        """
+        ⏱️ Avanza `dt` segundos y devuelve la lectura de cada tag
+        
+        Returns:
+            np.ndarray: Un valor por tag (NaN = lectura perdida en este tick)
+        """
+        n = self.cantidad
+        rng = self.rng
+        self.tiempo_s += dt
+        t = self.tiempo_s
+        
+        # Nivel del proceso: deriva + escalones ocasionales
+        nivel = self.nivel[:n]
+        nivel += self.deriva[:n] * dt
+        escalon = rng.random(n) < self.prob_escalon[:n] * dt
+        if escalon.any():
+            nivel[escalon] += rng.standard_normal(int(escalon.sum())) * self.tamano_escalon[:n][escalon]
+        
+        valores = (nivel
+                   + self.amplitud_seno[:n] * np.sin(2 * np.pi * t / self.periodo_s[:n] + self.fase[:n])
+                   + self.ruido[:n] * rng.standard_normal(n))
+        
+        # Tags congelados: repiten el último valor hasta que vence su plazo
+        congelado_hasta = self.congelado_hasta[:n]
+        nuevos = (congelado_hasta <= t) & (rng.random(n) < self.prob_congelado[:n] * dt)
+        congelado_hasta[nuevos] = t + self.duracion_congelado_s[:n][nuevos]
+        congelados = congelado_hasta > t
+        valores[congelados] = self.ultimo[:n][congelados]
+        self.ultimo[:n] = valores
+        
+        # Pérdidas de comunicación
+        valores[rng.random(n) < self.prob_perdida[:n]] = np.nan
+        return valores
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HERRAMIENTA: DIARIO DE EVENTOS (REGISTROS FIJOS + ANILLO + ARCHIVO APPEND-ONLY)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# Códigos de evento del diario (el índice es el código que se guarda)
+CODIGOS_DIARIO = ("dispositivo_registrado", "alarma_activada", "alarma_normalizada",
+                  "checkpoint_guardado")
+_CODIGO_DIARIO = {nombre: codigo for codigo, nombre in enumerate(CODIGOS_DIARIO)}
+
+PLANTILLAS_DIARIO = {
+    "dispositivo_registrado": "Dispositivo {dispositivo} registrado",
+    "alarma_activada": "Alarma {detalle} activada en {dispositivo}",
+    "alarma_normalizada": "Alarma {detalle} normalizada en {dispositivo}",
+    "checkpoint_guardado": "Checkpoint de {dispositivo} guardado",
+}
+
+# Registro fijo de 24 bytes: timestamp_ns, dispositivo, código, detalle, valor
+_REGISTRO_DIARIO = struct.Struct("<qIHHd")
+
+class RegistroEvento:
+    """📌 Evento del diario ya decodificado (str() da el texto clásico)"""
+    
+    __slots__ = ("timestamp_ns", "dispositivo", "codigo", "detalle", "valor")
+    
+    def __init__(self, timestamp_ns, dispositivo, codigo, detalle, valor):
+        self.timestamp_ns = timestamp_ns
+        self.dispositivo = dispositivo
+        self.codigo = codigo
+        self.detalle = detalle
+        self.valor = valor
+    
+    @property
+    def timestamp(self):
+        return formatear_timestamp(self.timestamp_ns)
+    
+    def como_lista(self):
+        return [self.timestamp_ns, self.dispositivo, self.codigo, self.detalle, self.valor]
+    
+    def __str__(self):
+        return PLANTILLAS_DIARIO[self.codigo].format(dispositivo=self.dispositivo,
+                                                     detalle=self.detalle)
+    
+    def __repr__(self):
+        return (f"RegistroEvento({self.timestamp!r}, {self.dispositivo!r}, "
+                f"{self.codigo!r}, {self.detalle!r}, {self.valor!r})")
+
+class TablaNombres:
+    """
+    🏷️ Tabla de nombres internados: nombre ↔ índice entero
+    
+    Con `ruta`, los nombres nuevos se agregan a un archivo de texto (uno por
+    línea); al abrirla de nuevo se recuperan los mismos índices.
+    """
+    
+    def __init__(self, ruta=None, maximo=2**32 - 1):
+        self.ruta = ruta
+        self.maximo = maximo
+        self.nombres = [""]          # Índice 0 = sin nombre
+        self._indices = {"": 0}
+        self._pendientes = []
+        if ruta is not None and os.path.exists(ruta):
+            with open(ruta, encoding="utf-8") as archivo:
+                for nombre in archivo.read().split("\n")[:-1]:
+                    self._indices[nombre] = len(self.nombres)
+                    self.nombres.append(nombre)
+    
+    def indice(self, nombre):
+        """Índice del nombre (lo agrega si es nuevo)"""
+        indice = self._indices.get(nombre)
+        if indice is None:
+            indice = len(self.nombres)
+            if indice > self.maximo:
+                raise ValueError(f"Tabla de nombres llena ({self.maximo} nombres)")
+            self.nombres.append(nombre)
+            self._indices[nombre] = indice
+            if self.ruta is not None:
+                self._pendientes.append(nombre)
+        return indice
+    
+    def buscar(self, nombre):
+        """Índice del nombre o None si nunca se usó"""
+        return self._indices.get(nombre)
+    
+    def vaciar(self):
+        if self._pendientes:
+            with open(self.ruta, "a", encoding="utf-8") as archivo:
+                archivo.write("".join(f"{nombre}\n" for nombre in self._pendientes))
+            self._pendientes = []
+
+class DiarioEventos:
+    """
+    📒 Diario de eventos acotado en memoria, con historia completa en disco
+    
+    - Cada evento es un registro binario FIJO de 24 bytes; dispositivos y
+      detalles se guardan como índices a tablas de nombres.
+    - Los últimos `capacidad_memoria` eventos viven en un anillo en RAM
+      (memoria constante, sin listas que crecen).
+    - Con `ruta`, todos los eventos se agregan (append-only, por lotes) a un
+      archivo; las consultas lo abren con mmap y buscan el rango de tiempo
+      por bisección, sin cargar el archivo entero.
+    
+    Las tablas de nombres van en archivos aparte ("<ruta>.nombres" y
+    "<ruta>.detalles", un nombre por línea), también de solo agregar.
+    
+    La bisección exige que el archivo esté ordenado por tiempo: con archivo,
+    una marca anterior a la última escrita (paso del NTP, cambio a un reloj
+    simulado) se registra con la última marca.
+    """
+    
+    def __init__(self, ruta=None, capacidad_memoria=4096, lote_escritura=256):
+        if capacidad_memoria <= 0:
+            raise ValueError("La capacidad del diario debe ser mayor que 0")
+        self.ruta = ruta
+        self.capacidad_memoria = capacidad_memoria
+        self.lote_escritura = lote_escritura
+        self._anillo = bytearray(capacidad_memoria * _REGISTRO_DIARIO.size)
+        self._siguiente = 0          # Posición del anillo donde va el próximo registro
+        self._en_anillo = 0
+        self.total_registrado = 0
+        self._pendientes = bytearray()
+        self._archivo = None
+        self._ultima_marca = -2**63
+        
+        if ruta is None:
+            self._dispositivos = TablaNombres()
+            self._detalles = TablaNombres(maximo=2**16 - 1)
+        else:
+            self._dispositivos = TablaNombres(f"{ruta}.nombres")
+            self._detalles = TablaNombres(f"{ruta}.detalles", maximo=2**16 - 1)
+            self._abrir_archivo(ruta)
+    
+    def _abrir_archivo(self, ruta):
+        """Abre (o crea) el archivo y carga su cola en el anillo"""
+        self._archivo = open(ruta, "ab")
+        
+        tamano = self._archivo.tell() // _REGISTRO_DIARIO.size
+        if self._archivo.tell() % _REGISTRO_DIARIO.size:
+            # Registro a medias de un corte anterior: se descarta para no
+            # desalinear todo lo que se agregue después
+            self._archivo.truncate(tamano * _REGISTRO_DIARIO.size)
+            self._archivo.seek(0, os.SEEK_END)
+        self.total_registrado = tamano
+        if tamano:
+            desde = max(0, tamano - self.capacidad_memoria)
+            with open(ruta, "rb") as lector:
+                lector.seek(desde * _REGISTRO_DIARIO.size)
+                cola = lector.read((tamano - desde) * _REGISTRO_DIARIO.size)
+            self._anillo[:len(cola)] = cola
+            self._en_anillo = tamano - desde
+            self._siguiente = self._en_anillo % self.capacidad_memoria
+            self._ultima_marca = struct.unpack_from("<q", cola, len(cola) - _REGISTRO_DIARIO.size)[0]
+    
+    def registrar(self, dispositivo, codigo, detalle="", valor=0.0, timestamp_ns=None):
+        """
+        ➕ Agrega un evento en O(1)
+        
+        Args:
+            dispositivo (str): Origen del evento
+            codigo (str): Uno de CODIGOS_DIARIO
+            detalle (str): Dato adicional (p. ej. nombre de la alarma)
+            valor (float): Valor asociado (p. ej. la lectura que disparó la alarma)
+            timestamp_ns (int): Marca de tiempo; por defecto el reloj global
+        """
+        if timestamp_ns is None:
+            timestamp_ns = reloj.ahora_ns()
+        if self._archivo is not None:
+            # Archivo siempre ordenado por tiempo (lo necesita la bisección de rango())
+            timestamp_ns = max(timestamp_ns, self._ultima_marca)
+            self._ultima_marca = timestamp_ns
+        datos = (timestamp_ns, self._dispositivos.indice(dispositivo), _CODIGO_DIARIO[codigo],
+                 self._detalles.indice(detalle), valor)
+        
+        _REGISTRO_DIARIO.pack_into(self._anillo, self._siguiente * _REGISTRO_DIARIO.size, *datos)
+        self._siguiente = (self._siguiente + 1) % self.capacidad_memoria
+        if self._en_anillo < self.capacidad_memoria:
+            self._en_anillo += 1
+        self.total_registrado += 1
+        
+        if self._archivo is not None:
+            self._pendientes += _REGISTRO_DIARIO.pack(*datos)
+            if len(self._pendientes) >= self.lote_escritura * _REGISTRO_DIARIO.size:
+                self.vaciar()
+    
+    def vaciar(self):
+        """💾 Escribe en disco los registros pendientes (nombres primero)"""
+        if self._archivo is None:
+            return
+        self._dispositivos.vaciar()
+        self._detalles.vaciar()
+        if self._pendientes:
+            self._archivo.write(self._pendientes)
+            self._archivo.flush()
+            self._pendientes = bytearray()
+    
+    def cerrar(self):
+        if self._archivo is not None:
+            self.vaciar()
+            self._archivo.close()
+            self._archivo = None
+    
+    def _decodificar(self, timestamp_ns, dispositivo, codigo, detalle, valor):
+        return RegistroEvento(timestamp_ns, self._dispositivos.nombres[dispositivo],
+                              CODIGOS_DIARIO[codigo], self._detalles.nombres[detalle], valor)
+    
+    def recientes(self, n=None):
+        """🕐 Los últimos n eventos en memoria, del más antiguo al más reciente"""
+        cantidad = self._en_anillo if n is None else min(n, self._en_anillo)
+        inicio = self._siguiente - cantidad
+        return [self._decodificar(*_REGISTRO_DIARIO.unpack_from(
+                    self._anillo, (posicion % self.capacidad_memoria) * _REGISTRO_DIARIO.size))
+                for posicion in range(inicio, self._siguiente)]
+    
+    def rango(self, desde=None, hasta=None, dispositivo=None, limite=None):
+        """
+        🔍 Eventos con desde <= timestamp <= hasta, opcionalmente de un dispositivo
+        
+        Con archivo consulta la historia completa (vía mmap y bisección por
+        tiempo); sin archivo, solo lo que queda en el anillo.
+        
+        Args:
+            desde, hasta: Límites (ns, datetime o string); None = sin límite
+            dispositivo (str): Filtrar por origen
+            limite (int): Máximo de eventos a devolver
+        """
+        desde = -2**63 if desde is None else a_epoch_ns(desde)
+        hasta = 2**63 - 1 if hasta is None else a_epoch_ns(hasta)
+        filtro = None
+        if dispositivo is not None:
+            filtro = self._dispositivos.buscar(dispositivo)
+            if filtro is None:
+                return []
+        
+        if self._archivo is None:
+            return [registro for registro in self.recientes()
+                    if desde <= registro.timestamp_ns <= hasta
+                    and (filtro is None or registro.dispositivo == dispositivo)][:limite]
+        
+        self.vaciar()
+        if not self.total_registrado:
+            return []
+        resultado = []
+        with open(self.ruta, "rb") as archivo, \
+                mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            tamano = _REGISTRO_DIARIO.size
+            # Bisección: primer registro con timestamp >= desde
+            bajo, alto = 0, len(mapa) // tamano
+            while bajo < alto:
+                medio = (bajo + alto) // 2
+                if struct.unpack_from("<q", mapa, medio * tamano)[0] < desde:
+                    bajo = medio + 1
+                else:
+                    alto = medio
+            # Recorrido sin copiar el archivo: vista sobre el mapa desde ese registro
+            vista = memoryview(mapa)
+            registros = _REGISTRO_DIARIO.iter_unpack(vista[bajo * tamano:])
+            try:
+                for datos in registros:
+                    if datos[0] > hasta or (limite is not None and len(resultado) >= limite):
+                        break
+                    if filtro is None or datos[1] == filtro:
+                        resultado.append(self._decodificar(*datos))
+            finally:
+                del registros     # Soltar las vistas antes de cerrar el mmap
+                vista.release()
+        return resultado
+    
+    def __len__(self):
+        return self.total_registrado
+    
+    def __iter__(self):
+        return iter(self.recientes())
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# HERRAMIENTA: CHECKPOINT BINARIO PARA REINICIO EN CALIENTE
+# ═══════════════════════════════════════════════════════════════════════════════
+
+"""
+💾 FORMATO DEL CHECKPOINT
+
+    [cabecera fija]  MAGIC (8 bytes) | versión (uint32) | largo JSON (uint64)
+    [metadatos]      JSON: planta, dispositivos, estado de alarmas, eventos...
+    [relleno]        hasta múltiplo de 8 bytes
+    [bloques]        arrays binarios nativos (float64 / int64 / int8)
+
+Los bloques no se parsean: al abrir el archivo con mmap se exponen como
+memoryview y se copian en bloque a los historiales. Cargar una planta grande
+cuesta lo que cuesta leer el archivo, no reconstruir lectura por lectura.
+"""
+
+MAGIC_CHECKPOINT = b"SCADACK1"
+VERSION_CHECKPOINT = 1
+_CABECERA_CHECKPOINT = struct.Struct("<8sIQ")
+
+# Atributos que el checkpoint guarda aparte (no son escalares del sensor)
+_ATRIBUTOS_NO_ESCALARES = frozenset({
+    "historial", "estadisticas", "estadisticas_ventana", "motor_alarmas",
+    "al_cambiar_estado", "al_registrar_lectura"
+})
+
+def _alinear(posicion, multiplo=8):
+    return (posicion + multiplo - 1) // multiplo * multiplo
+
+class EscritorCheckpoint:
+    """
+    ✍️ Acumula metadatos y bloques binarios y los escribe de forma atómica
+    
+    Se escribe a un archivo temporal y se renombra al final (os.replace):
+    un corte de energía a mitad de escritura deja intacto el checkpoint previo.
+    """
+    
+    def __init__(self):
+        self.bloques = []       # Lista de partes (buffers) por bloque
+        self.indice = {}        # nombre → [offset, tipo, cantidad]
+        self._offset = 0
+    
+    def agregar_bloque(self, nombre, partes, tipo):
+        """
+        Registra un bloque formado por una o varias partes contiguas
+        
+        Args:
+            nombre (str): Nombre del bloque en el índice
+            partes: Buffer (array, memoryview, ndarray) o lista de buffers
+            tipo (str): Código de array de los elementos ('d', 'q', 'b')
+        """
+        if not isinstance(partes, list):
+            partes = [partes]
+        partes = [memoryview(parte).cast("B") for parte in partes]
+        largo = sum(len(parte) for parte in partes)
+        self.indice[nombre] = [self._offset, tipo, largo // array(tipo).itemsize]
+        self.bloques.append(partes)
+        self._offset = _alinear(self._offset + largo)
+    
+    def escribir(self, ruta, metadatos):
+        metadatos = dict(metadatos, bloques=self.indice)
+        cabecera = json.dumps(metadatos, ensure_ascii=False,
+                              separators=(",", ":")).encode("utf-8")
+        inicio_datos = _alinear(_CABECERA_CHECKPOINT.size + len(cabecera))
+        
+        temporal = f"{ruta}.tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(_CABECERA_CHECKPOINT.pack(MAGIC_CHECKPOINT, VERSION_CHECKPOINT,
+                                                    len(cabecera)))
+            archivo.write(cabecera)
+            archivo.write(b"\0" * (inicio_datos - archivo.tell()))
+            for partes in self.bloques:
+                largo = 0
+                for parte in partes:
+                    archivo.write(parte)
+                    largo += len(parte)
+                archivo.write(b"\0" * (_alinear(largo) - largo))
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, ruta)
+        return inicio_datos + self._offset
+
+class CheckpointSCADA:
+    """
+    📂 Checkpoint abierto con mmap (solo lectura)
+    
+    bloque() y historial() devuelven memoryviews SOBRE EL ARCHIVO: no se
+    copia nada hasta que alguien escribe los datos en otro lado. Hay que
+    liberar esas vistas antes de cerrar().
+    """
+    
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._archivo = open(ruta, "rb")
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, largo = _CABECERA_CHECKPOINT.unpack_from(self._mapa, 0)
+            if magic != MAGIC_CHECKPOINT:
+                raise ValueError(f"{ruta} no es un checkpoint SCADA")
+            if version != VERSION_CHECKPOINT:
+                raise ValueError(f"Versión de checkpoint no soportada: {version}")
+            inicio = _CABECERA_CHECKPOINT.size
+            self.metadatos = json.loads(self._mapa[inicio:inicio + largo].decode("utf-8"))
+        except Exception:
+            self.cerrar()
+            raise
+        self._inicio_datos = _alinear(inicio + largo)
+        self._vista = memoryview(self._mapa)
+    
+    def bloque(self, nombre):
+        """Vista sin copia de un bloque, con su tipo nativo ('d', 'q', 'b')"""
+        offset, tipo, cantidad = self.metadatos["bloques"][nombre]
+        inicio = self._inicio_datos + offset
+        return self._vista[inicio:inicio + cantidad * array(tipo).itemsize].cast(tipo)
+    
+    def historial(self, id_sensor):
+        """(valores, timestamps) guardados de un sensor, como memoryviews"""
+        estado = self.metadatos["dispositivos"][id_sensor]["historial"]
+        inicio, fin = estado["desde"], estado["desde"] + estado["cantidad"]
+        return self.bloque("valores")[inicio:fin], self.bloque("timestamps")[inicio:fin]
+    
+    def cerrar(self):
+        vista = getattr(self, "_vista", None)
+        if vista is not None:
+            vista.release()
+            self._vista = None
+        mapa = getattr(self, "_mapa", None)
+        if mapa is not None:
+            mapa.close()
+            self._mapa = None
+        self._archivo.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
+
+def _clase_checkpoint(nombre):
+    """Resuelve el nombre de clase guardado (solo sensores de esta jerarquía)"""
+    clase = globals().get(nombre)
+    if not (isinstance(clase, type) and issubclass(clase, SensorIndustrial)):
+        raise ValueError(f"Clase de dispositivo no restaurable: {nombre}")
+    return clase
+
+class InstantaneaSCADA:
+    """
+    📸 Foto INMUTABLE y versionada del estado del SistemaSCADA
+    
+    El escaneo construye una instantánea nueva al final de cada ciclo y la
+    publica con una sola asignación (atómica en CPython). Los lectores (por
+    ejemplo, hilos de Flask) toman la referencia y trabajan sobre ella sin
+    locks: nunca ven una lista de alarmas a medio reconstruir.
+    
+    Copy-on-write: los registros de dispositivos que no cambiaron se
+    comparten con la instantánea anterior. Los diccionarios que contiene son
+    de SOLO LECTURA por convención.
+    """
+    
+    __slots__ = ("version", "timestamp_ns", "planta", "resumen", "zonas",
+                 "alarmas", "dispositivos")
+    
+    def __init__(self, version, timestamp_ns, planta, resumen, zonas, alarmas, dispositivos):
+        self.version = version
+        self.timestamp_ns = timestamp_ns
+        self.planta = planta
+        self.resumen = resumen            # dict con los contadores globales
+        self.zonas = zonas                # zona → dict de contadores
+        self.alarmas = alarmas            # tuple de dicts de alarma
+        self.dispositivos = dispositivos  # secuencia de dicts exportables
+    
+    @property
+    def timestamp(self):
+        return formatear_timestamp(self.timestamp_ns)
+    
+    def exportar(self):
+        """Diccionario con el formato de SistemaSCADA.exportar_datos_json()"""
+        return {
+            'planta': self.planta,
+            'timestamp': self.timestamp,
+            'dispositivos': list(self.dispositivos),
+            'alarmas': list(self.alarmas),
+            'resumen': dict(self.resumen)
+        }
+
+class RegistrosBancoCongelados:
+    """
+    🧊 Dispositivos de una instantánea en modo columnar
+    
+    Publicar solo copia las columnas que cambian en cada escaneo (valor,
+    código, total, marca): una copia de memoria contigua. Los diccionarios
+    por dispositivo se generan recién al recorrerla.
+    """
+    
+    def __init__(self, banco_congelado, construir_registro):
+        self.banco = banco_congelado
+        self._construir = construir_registro
+    
+    def __len__(self):
+        return self.banco.cantidad
+    
+    def __iter__(self):
+        banco = self.banco
+        for i in range(banco.cantidad):
+            yield self._construir(banco.ids[i], VistaSensorBanco(banco, i))
+
+class SistemaSCADA:
+    """
+    🏭 PROYECTO INTEGRADOR: Sistema SCADA que demuestra todos los conceptos POO
+    
+    Este sistema simula un SCADA real que:
+    - Gestiona múltiples tipos de dispositivos
+    - Procesa datos en tiempo real
+    - Genera reportes y alarmas
+    - Prepara datos para APIs (Flask) y bases de datos (SQL)
+    
+    Con modo_columnar=True los sensores se guardan en un BancoSensores (NumPy)
+    y self.dispositivos contiene vistas ligeras en lugar de objetos completos.
+    
+    Los contadores globales y por zona se mantienen de forma INCREMENTAL: solo
+    se recalculan para los dispositivos que cambiaron de estado, de modo que
+    los resúmenes cuestan O(dispositivos cambiados) y no O(toda la planta).
+    
+    dispositivos_criticos() responde "los N peores" con índices IndiceTopK
+    que se actualizan en cada lectura.
+    
+    Cada escaneo publica una InstantaneaSCADA; las exportaciones leen de
+    ella, así la API puede servir datos mientras la adquisición sigue.
+    """
+    
+    def __init__(self, nombre_planta, modo_columnar=False, ruta_diario=None):
+        self.nombre_planta = nombre_planta
+        self.dispositivos = {}
+        # Diario acotado en RAM; con ruta_diario guarda la historia completa en disco
+        self.historial_eventos = DiarioEventos(ruta_diario)
+        self.alarmas_activas = []
+        self.estado_sistema = "iniciando"
+        self.banco = BancoSensores() if modo_columnar else None
+        
+        # Contadores incrementales
+        self.contadores = {'dispositivos': 0, 'operativos': 0, 'alarmas': 0}
+        self.contadores_zona = {}
+        self._estado_contado = {}           # id → (zona, operativo, n_alarmas)
+        self._alarmas_por_dispositivo = {}  # id → alarmas activas del dispositivo
+        self._pendientes = set()            # ids que avisaron un cambio de estado
+        self.indices_top = {}               # criterio → IndiceTopK
+        self.simulador = None               # SimuladorSenales (fila i = i-ésimo dispositivo)
+        self.paso_simulacion_s = 1.0
+        
+        # Instantáneas copy-on-write para lectores concurrentes
+        self._version = 0
+        self._registros_publicados = {}     # id → ((total, estado), registro)
+        self._alarmas_publicadas = (None, ())
+        self._instantanea = None
+        self.publicar_instantanea()
+        
+        eventos.publicar("scada_iniciado", nombre_planta)
+    
+    def registrar_dispositivo(self, dispositivo):
+        """Registrar un nuevo dispositivo en el sistema"""
+        if self.banco is not None:
+            dispositivo = self.banco.agregar(dispositivo)
+        elif hasattr(dispositivo, "al_cambiar_estado"):
+            dispositivo.al_cambiar_estado = self._marcar_cambio
+            if self.indices_top:
+                self._indexar_dispositivo(dispositivo)
+        self.dispositivos[dispositivo.id_sensor] = dispositivo
+        if self.simulador is not None:
+            self.simulador.agregar(1, **self._perfil_simulacion([dispositivo]))
+        self._refrescar_contadores(dispositivo.id_sensor)
+        self._reconstruir_alarmas()
+        self.historial_eventos.registrar(dispositivo.id_sensor, "dispositivo_registrado")
+        eventos.publicar("dispositivo_registrado", self.nombre_planta,
+                         dispositivo=dispositivo.id_sensor)
+    
+    def crear_indice_top(self, criterio="desviacion"):
+        """
+        🔥 Crea (o devuelve) el índice top-k de un criterio de CRITERIOS_TOP
+        
+        A partir de aquí cada lectura actualiza el índice; los dispositivos
+        ya leídos se cargan con su última lectura.
+        """
+        if criterio not in CRITERIOS_TOP:
+            raise ValueError(f"Criterio desconocido: {criterio}")
+        if criterio not in self.indices_top:
+            self.indices_top[criterio] = IndiceTopK()
+            if self.banco is None:
+                for dispositivo in self.dispositivos.values():
+                    self._indexar_dispositivo(dispositivo)
+        return self.indices_top[criterio]
+    
+    def _indexar_dispositivo(self, dispositivo):
+        """Engancha el dispositivo a los índices y lo carga con su última lectura"""
+        dispositivo.al_registrar_lectura = self._actualizar_indices
+        ultima = dispositivo.obtener_ultima_lectura()
+        if ultima is not None:
+            self._actualizar_indices(dispositivo, ultima[1])
+    
+    def _actualizar_indices(self, dispositivo, valor):
+        """Callback por lectura: recalcula el puntaje del dispositivo en cada índice"""
+        for criterio, indice in self.indices_top.items():
+            indice.actualizar(dispositivo.id_sensor, CRITERIOS_TOP[criterio](dispositivo, valor))
+    
+    def dispositivos_criticos(self, k=10, criterio="desviacion"):
+        """
+        🏆 Los k dispositivos "más calientes" según el criterio
+        
+        Args:
+            k (int): Cantidad de dispositivos
+            criterio (str): 'valor', 'desviacion' o 'severidad'
+        
+        Returns:
+            list: Tuplas (id_dispositivo, puntaje) de mayor a menor
+        """
+        if self.banco is not None:
+            return self.banco.top(k, criterio)
+        return self.crear_indice_top(criterio).top(k)
+    
+    def escanear_dispositivos(self):
+        """Escanear todos los dispositivos y actualizar estados"""
+        if eventos.activo:
+            eventos.publicar("escaneo", self.nombre_planta, cantidad=len(self.dispositivos))
+        
+        # Una sola marca de tiempo para todas las lecturas del ciclo
+        with reloj.ciclo() as marca_ns:
+            if self.simulador is not None:
+                self._escanear_simulador(marca_ns)
+            elif self.banco is not None:
+                # Modo columnar: todo el ciclo en operaciones vectorizadas
+                self.banco.escanear(marca_ns)
+            else:
+                for id_dispositivo, dispositivo in self.dispositivos.items():
+                    valor = self._simular_valor(dispositivo)
+                    if valor is not None:
+                        dispositivo.registrar_lectura(valor, marca_ns)
+        
+        self.publicar_instantanea()
+    
+    @staticmethod
+    def _rango_simulacion(dispositivo):
+        """(mínimo, amplitud) de los valores simulados del dispositivo, o None"""
+        if isinstance(dispositivo, SensorTemperaturaAvanzado):
+            # Temperatura dentro de rangos (con un 20% por encima del máximo)
+            rango = dispositivo.limite_max - dispositivo.limite_min
+            return dispositivo.limite_min, rango * 1.2
+        elif isinstance(dispositivo, SensorPresion):
+            return 0.0, dispositivo.presion_maxima * 1.1
+        elif isinstance(dispositivo, VistaSensorBanco):
+            banco, i = dispositivo.banco, dispositivo.indice
+            return float(banco.base_sim[i]), float(banco.amplitud_sim[i])
+        return None
+    
+    @staticmethod
+    def _simular_valor(dispositivo):
+        """Simular lectura según tipo de dispositivo (None si no se sabe simular)"""
+        rango = SistemaSCADA._rango_simulacion(dispositivo)
+        if rango is None:
+            return None
+        minimo, amplitud = rango
+        return minimo + random.uniform(0, amplitud)
+    
+    def configurar_simulador(self, semilla=None, paso_s=1.0, **parametros):
+        """
+        📈 Usa un SimuladorSenales como fuente de datos de escanear_dispositivos()
+        
+        Cada dispositivo recibe un perfil derivado de su rango de simulación
+        (nivel medio, seno de ±30%, ruido de 5%, escalones, congelamientos y
+        pérdidas poco frecuentes). `parametros` reemplaza cualquier valor del
+        perfil para todos los dispositivos.
+        
+        Args:
+            semilla (int): Semilla para ciclos reproducibles
+            paso_s (float): Segundos simulados por escaneo
+        
+        Returns:
+            SimuladorSenales: El simulador instalado
+        """
+        self.simulador = SimuladorSenales(semilla, capacidad_inicial=max(len(self.dispositivos), 1))
+        self.paso_simulacion_s = paso_s
+        self._parametros_simulacion = parametros
+        if self.dispositivos:
+            self.simulador.agregar(len(self.dispositivos),
+                                   **self._perfil_simulacion(list(self.dispositivos.values())))
+        return self.simulador
+    
+    def _perfil_simulacion(self, dispositivos):
+        """Parámetros de SimuladorSenales (arrays) para una lista de dispositivos"""
+        if self.banco is not None and dispositivos and all(
+                isinstance(dispositivo, VistaSensorBanco) for dispositivo in dispositivos):
+            filas = [dispositivo.indice for dispositivo in dispositivos]
+            minimo = self.banco.base_sim[filas]
+            amplitud = self.banco.amplitud_sim[filas]
+        else:
+            rangos = [self._rango_simulacion(dispositivo) or (0.0, 0.0)
+                      for dispositivo in dispositivos]
+            minimo = np.array([rango[0] for rango in rangos], dtype=np.float64)
+            amplitud = np.array([rango[1] for rango in rangos], dtype=np.float64)
+        
+        perfil = {
+            "base": minimo + amplitud / 2,
+            "amplitud_seno": amplitud * 0.3,
+            "periodo_s": 300.0,
+            "fase": self.simulador.rng.uniform(0, 2 * np.pi, len(dispositivos)),
+            "ruido": amplitud * 0.05,
+            "prob_escalon": 0.002, "tamano_escalon": amplitud * 0.1,
+            "prob_congelado": 0.001, "duracion_congelado_s": 30.0,
+            "prob_perdida": 0.01,
+        }
+        perfil.update(self._parametros_simulacion)
+        return perfil
+    
+    def _escanear_simulador(self, marca_ns):
+        """Un tick del simulador aplicado a todos los dispositivos (NaN = sin lectura)"""
+        valores = self.simulador.tick(self.paso_simulacion_s)
+        if self.banco is not None:
+            self.banco.registrar_lecturas(valores, marca_ns, validas=~np.isnan(valores))
+            return
+        for dispositivo, valor in zip(self.dispositivos.values(), valores.tolist()):
+            if valor == valor:   # NaN != NaN: lectura perdida
+                dispositivo.registrar_lectura(valor, marca_ns)
+    
+    async def _lector_simulado(self, dispositivo):
+        """Lector asíncrono por defecto: latencia de red simulada + valor aleatorio"""
+        await asyncio.sleep(random.uniform(*DispositivoModbus.latencia_simulada))
+        return self._simular_valor(dispositivo)
+    
+    async def escanear_dispositivos_async(self, lector=None, concurrencia=100, timeout=1.0):
+        """
+        ⚡ Escaneo asíncrono: todos los dispositivos se consultan a la vez
+        
+        El tiempo de ciclo pasa de SUMA(latencias) a MÁX(latencias). Un
+        semáforo limita cuántas lecturas hay en vuelo y cada dispositivo
+        tiene su propio timeout, así uno lento no frena al resto.
+        
+        Args:
+            lector: Coroutine `async def lector(dispositivo) -> valor`; por
+                defecto simula latencia de red. Puede envolver, por ejemplo,
+                DispositivoModbus.leer_registro_async.
+            concurrencia (int): Máximo de lecturas simultáneas
+            timeout (float): Segundos máximos por dispositivo
+        
+        Returns:
+            dict: Resumen del ciclo (leídos, timeouts, errores, duración)
+        """
+        lector = lector or self._lector_simulado
+        semaforo = asyncio.Semaphore(concurrencia)
+        
+        async def leer(id_dispositivo, dispositivo):
+            async with semaforo:
+                try:
+                    valor = await asyncio.wait_for(lector(dispositivo), timeout)
+                    return id_dispositivo, valor, None
+                except asyncio.TimeoutError:
+                    return id_dispositivo, None, "timeout"
+                except Exception as error:
+                    return id_dispositivo, None, str(error)
+        
+        inicio = time.perf_counter()
+        resultados = await asyncio.gather(*(leer(id_dispositivo, dispositivo)
+                                            for id_dispositivo, dispositivo
+                                            in self.dispositivos.items()))
+        
+        # Recolección del ciclo: se aplican todas las lecturas juntas
+        resumen = {'leidos': 0, 'timeouts': [], 'errores': {}}
+        marca_ns = reloj.ahora_ns()
+        if self.banco is not None:
+            valores = self.banco.valor[:self.banco.cantidad].copy()
+        for id_dispositivo, valor, error in resultados:
+            if error == "timeout":
+                resumen['timeouts'].append(id_dispositivo)
+            elif error is not None:
+                resumen['errores'][id_dispositivo] = error
+            elif valor is not None:
+                resumen['leidos'] += 1
+                if self.banco is not None:
+                    valores[self.banco.indices[id_dispositivo]] = valor
+                else:
+                    self.dispositivos[id_dispositivo].registrar_lectura(valor, marca_ns)
+        if self.banco is not None:
+            self.banco.registrar_lecturas(valores, marca_ns)
+        
+        self.publicar_instantanea()
+        resumen['duracion_s'] = time.perf_counter() - inicio
+        return resumen
+    
+    def escanear_dispositivos_concurrente(self, **opciones):
+        """🔄 Ejecuta un ciclo asíncrono desde código síncrono (asyncio.run)"""
+        return asyncio.run(self.escanear_dispositivos_async(**opciones))
+    
+    def _marcar_cambio(self, dispositivo):
+        """Callback de los sensores: anota que su estado/alarmas cambiaron"""
+        self._pendientes.add(dispositivo.id_sensor)
+    
+    def _refrescar_contadores(self, id_dispositivo):
+        """
+        🔢 Actualiza contadores y alarmas de UN dispositivo
+        
+        Resta lo que el dispositivo aportaba antes y suma su estado actual.
+        """
+        dispositivo = self.dispositivos[id_dispositivo]
+        globales = self.contadores
+        
+        previo = self._estado_contado.get(id_dispositivo)
+        if previo is None:
+            globales['dispositivos'] += 1
+        else:
+            zona_previa, operativo_previo, alarmas_previas = previo
+            stats = self.contadores_zona[zona_previa]
+            stats['dispositivos'] -= 1
+            stats['operativos'] -= operativo_previo
+            stats['alarmas'] -= alarmas_previas
+            globales['operativos'] -= operativo_previo
+            globales['alarmas'] -= alarmas_previas
+        
+        zona = dispositivo.ubicacion
+        operativo = dispositivo.estado == "operativo"
+        alarmas = dispositivo.alarmas
+        stats = self.contadores_zona.setdefault(
+            zona, {'dispositivos': 0, 'operativos': 0, 'alarmas': 0})
+        stats['dispositivos'] += 1
+        stats['operativos'] += operativo
+        stats['alarmas'] += len(alarmas)
+        globales['operativos'] += operativo
+        globales['alarmas'] += len(alarmas)
+        self._estado_contado[id_dispositivo] = (zona, operativo, len(alarmas))
+        
+        previas = self._alarmas_por_dispositivo.get(id_dispositivo, ())
+        if len(previas) != len(alarmas) or any(
+                previa['tipo_alarma'] != alarma for previa, alarma in zip(previas, alarmas)):
+            self._registrar_cambios_alarmas(dispositivo, [previa['tipo_alarma'] for previa in previas])
+        
+        if alarmas:
+            self._alarmas_por_dispositivo[id_dispositivo] = [{
+                'dispositivo': id_dispositivo,
+                'tipo_alarma': alarma,
+                'ubicacion': zona,
+                'estado': dispositivo.estado
+            } for alarma in alarmas]
+        else:
+            self._alarmas_por_dispositivo.pop(id_dispositivo, None)
+    
+    def _registrar_cambios_alarmas(self, dispositivo, previas):
+        """📒 Anota en el diario las alarmas que aparecieron o desaparecieron"""
+        ultima = dispositivo.obtener_ultima_lectura()
+        valor = ultima[1] if ultima else 0.0
+        actuales = dispositivo.alarmas
+        for alarma in actuales:
+            if alarma not in previas:
+                self.historial_eventos.registrar(dispositivo.id_sensor, "alarma_activada",
+                                                 alarma, valor)
+        for alarma in previas:
+            if alarma not in actuales:
+                self.historial_eventos.registrar(dispositivo.id_sensor, "alarma_normalizada",
+                                                 alarma, valor)
+    
+    def _reconstruir_alarmas(self):
+        """Reconstruye la lista pública recorriendo solo dispositivos en alarma"""
+        # Lista NUEVA (no clear + rebuild): quien tenga la anterior la ve entera
+        self.alarmas_activas = [alarma
+                                for alarmas in self._alarmas_por_dispositivo.values()
+                                for alarma in alarmas]
+    
+    def _actualizar_alarmas(self):
+        """Actualizar alarmas y contadores SOLO de los dispositivos que cambiaron"""
+        if self.banco is not None:
+            cambiados = [self.banco.ids[i] for i in self.banco.tomar_cambios()]
+        else:
+            cambiados = self._pendientes
+            self._pendientes = set()
+        
+        if not cambiados:
+            return
+        for id_dispositivo in cambiados:
+            self._refrescar_contadores(id_dispositivo)
+        self._reconstruir_alarmas()
+    
+    def publicar_instantanea(self):
+        """
+        📸 Construye y publica una InstantaneaSCADA nueva
+        
+        Lo llama el escaneo al terminar cada ciclo; también puede llamarse
+        a mano tras registrar dispositivos o lecturas fuera del escaneo.
+        
+        Returns:
+            InstantaneaSCADA: La instantánea publicada
+        """
+        self._actualizar_alarmas()
+        self._version += 1
+        
+        if self.banco is not None:
+            dispositivos = RegistrosBancoCongelados(self.banco.congelar(),
+                                                    self._datos_dispositivo)
+        else:
+            dispositivos = tuple(self._registro_publicado(id_dispositivo, dispositivo)
+                                 for id_dispositivo, dispositivo in self.dispositivos.items())
+        
+        # La tupla de alarmas solo se rehace si la lista fue reconstruida
+        origen, alarmas = self._alarmas_publicadas
+        if origen is not self.alarmas_activas:
+            alarmas = tuple(self.alarmas_activas)
+            self._alarmas_publicadas = (self.alarmas_activas, alarmas)
+        
+        instantanea = InstantaneaSCADA(
+            version=self._version,
+            timestamp_ns=reloj.ahora_ns(),
+            planta=self.nombre_planta,
+            resumen={
+                'total_dispositivos': self.contadores['dispositivos'],
+                'dispositivos_operativos': self.contadores['operativos'],
+                'total_alarmas': self.contadores['alarmas']
+            },
+            zonas={zona: dict(stats) for zona, stats in self.contadores_zona.items()},
+            alarmas=alarmas,
+            dispositivos=dispositivos
+        )
+        self._instantanea = instantanea   # Publicación atómica: una sola asignación
+        return instantanea
+    
+    def instantanea(self):
+        """📖 Última instantánea publicada (lectura sin locks, desde cualquier hilo)"""
+        return self._instantanea
+    
+    def _registro_publicado(self, id_dispositivo, dispositivo):
+        """Registro exportable del dispositivo, reutilizado si no cambió"""
+        clave = (dispositivo.total_lecturas, dispositivo.estado)
+        previo = self._registros_publicados.get(id_dispositivo)
+        if previo is not None and previo[0] == clave:
+            return previo[1]
+        registro = self._datos_dispositivo(id_dispositivo, dispositivo)
+        self._registros_publicados[id_dispositivo] = (clave, registro)
+        return registro
+    
+    def generar_reporte_ejecutivo(self):
+        """Generar reporte completo del sistema"""
+        print(f"\n🏭 REPORTE EJECUTIVO - {self.nombre_planta}")
+        print(f"{'='*70}")
+        
+        self._actualizar_alarmas()
+        
+        # Estadísticas generales (contadores incrementales)
+        total_dispositivos = self.contadores['dispositivos']
+        dispositivos_operativos = self.contadores['operativos']
+        
+        print(f"📊 RESUMEN GENERAL:")
+        print(f"   🔧 Total dispositivos: {total_dispositivos}")
+        print(f"   ✅ Dispositivos operativos: {dispositivos_operativos}")
+        print(f"   🚨 Alarmas activas: {len(self.alarmas_activas)}")
+        print(f"   📈 Disponibilidad: {(dispositivos_operativos/total_dispositivos*100):.1f}%")
+        
+        # Detalle de alarmas
+        if self.alarmas_activas:
+            print(f"\n🚨 ALARMAS ACTIVAS:")
+            for alarma in self.alarmas_activas:
+                print(f"   ⚠️ {alarma['dispositivo']}: {alarma['tipo_alarma']}")
+                print(f"      📍 {alarma['ubicacion']} | Estado: {alarma['estado']}")
+        else:
+            print(f"\n✅ Sin alarmas activas - Sistema operando normalmente")
+        
+        # Detalle por zonas (contadores incrementales)
+        print(f"\n📍 ESTADO POR ZONAS:")
+        for zona, stats in self.contadores_zona.items():
+            if not stats['dispositivos']:
+                continue
+            disponibilidad = (stats['operativos'] / stats['dispositivos'] * 100)
+            print(f"   🏭 {zona}:")
+            print(f"      📊 {stats['dispositivos']} dispositivos | "
+                  f"✅ {stats['operativos']} operativos | "
+                  f"🚨 {stats['alarmas']} alarmas | "
+                  f"📈 {disponibilidad:.1f}% disponibilidad")
+    
+    def exportar_datos_json(self):
+        """
+        Preparar datos para API Flask (formato JSON)
+        
+        Lee de la última instantánea publicada: es seguro llamarlo desde el
+        hilo de la API mientras otro hilo escanea.
+        """
+        return self.instantanea().exportar()
+    
+    def exportar_datos_json_stream(self, tamano_bloque=500, rapido=True):
+        """
+        🌊 Exportación JSON en streaming: genera el documento por fragmentos
+        
+        Produce el mismo contenido que exportar_datos_json() pero sin armar el
+        diccionario gigante: cada dispositivo se serializa y se entrega en
+        bloques de `tamano_bloque` dispositivos. La memoria queda constante y
+        el primer byte sale de inmediato.
+        
+        Args:
+            tamano_bloque (int): Dispositivos por fragmento entregado
+            rapido (bool): Usar orjson si está instalado
+        
+        Yields:
+            str: Fragmentos que concatenados forman un JSON válido
+        
+        🌐 USO EN FLASK:
+            return Response(stream_with_context(scada.exportar_datos_json_stream()),
+                            mimetype="application/json")
+        """
+        codificar = self._codificador_json(rapido)
+        # Toda la respuesta sale de UNA instantánea, aunque el escaneo siga
+        instantanea = self.instantanea()
+        
+        # Cabecera: todo lo pequeño primero, la lista de dispositivos al final
+        yield ('{"planta":' + codificar(instantanea.planta)
+               + ',"timestamp":' + codificar(instantanea.timestamp)
+               + ',"resumen":' + codificar(instantanea.resumen)
+               + ',"alarmas":')
+        yield from self._fragmentos_lista(instantanea.alarmas, codificar, tamano_bloque)
+        yield ',"dispositivos":'
+        yield from self._fragmentos_lista(instantanea.dispositivos, codificar, tamano_bloque)
+        yield '}'
+    
+    @staticmethod
+    def _codificador_json(rapido):
+        """Devuelve una función objeto → str JSON (orjson si se pide y existe)"""
+        if rapido and orjson is not None:
+            return lambda objeto: orjson.dumps(objeto).decode("utf-8")
+        return lambda objeto: json.dumps(objeto, ensure_ascii=False, separators=(",", ":"))
+    
+    @staticmethod
+    def _fragmentos_lista(elementos, codificar, tamano_bloque):
+        """Serializa un iterable como lista JSON, entregando bloques de elementos"""
+        bloque = ['[']
+        separador = ''
+        for elemento in elementos:
+            bloque.append(separador)
+            bloque.append(codificar(elemento))
+            separador = ','
+            if len(bloque) >= 2 * tamano_bloque:
+                yield ''.join(bloque)
+                bloque = []
+        bloque.append(']')
+        yield ''.join(bloque)
+    
+    @staticmethod
+    def _datos_dispositivo(id_dispositivo, dispositivo):
+        """Diccionario exportable de un dispositivo"""
+        ultima_lectura = dispositivo.obtener_ultima_lectura()
+        return {
+            'id': id_dispositivo,
+            'tipo': dispositivo.nombre_tipo,
+            'ubicacion': dispositivo.ubicacion,
+            'estado': dispositivo.estado,
+            'unidad_medida': dispositivo.unidad_medida,
+            'ultima_lectura': {
+                'timestamp': ultima_lectura[0] if ultima_lectura else None,
+                'valor': ultima_lectura[1] if ultima_lectura else None
+            },
+            'total_lecturas': dispositivo.total_lecturas
+        }
+    
+    def _obtener_timestamp(self):
+        """Obtener timestamp actual"""
+        return formatear_timestamp(reloj.ahora_ns())
+    
+    def cerrar(self):
+        """🔒 Cierra el sistema: escribe los eventos pendientes del diario en disco"""
+        self.historial_eventos.cerrar()
+        
+    def __enter__(self):
+        return self
+        
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
+        
+    def guardar_checkpoint(self, ruta):
+        """
+        💾 Guarda el estado completo de la planta en un checkpoint binario
+        
+        Incluye configuración y estado de cada dispositivo, historiales,
+        estado interno de alarmas (retardos en curso) y eventos del sistema.
+        Pensado para llamarse periódicamente; la escritura es atómica.
+        
+        Returns:
+            int: Tamaño del checkpoint en bytes
+        """
+        self._actualizar_alarmas()
+        self.historial_eventos.registrar(self.nombre_planta, "checkpoint_guardado")
+        self.historial_eventos.vaciar()
+        escritor = EscritorCheckpoint()
+        metadatos = {
+            'planta': self.nombre_planta,
+            'creado_ns': reloj.ahora_ns(),
+            'estado_sistema': self.estado_sistema,
+            'version_instantanea': self._version,
+            'ruta_diario': self.historial_eventos.ruta,
+            'historial_eventos': [registro.como_lista()
+                                  for registro in self.historial_eventos.recientes()],
+        }
+        
+        if self.banco is not None:
+            banco = self.banco
+            for nombre, tipo in banco.COLUMNAS.items():
+                escritor.agregar_bloque(f"banco.{nombre}", getattr(banco, nombre)[:banco.cantidad], tipo)
+            metadatos['banco'] = {'ids': banco.ids, 'ubicaciones': banco.ubicaciones,
+                                  'unidades': banco.unidades, 'tipos_nombre': banco.tipos_nombre}
+        else:
+            dispositivos, valores, timestamps = {}, [], []
+            desde = 0
+            for id_dispositivo, dispositivo in self.dispositivos.items():
+                historial = dispositivo.historial
+                valores.append(array('d', historial.valores()))
+                timestamps.append(array('q', historial.timestamps()))
+                dispositivos[id_dispositivo] = self._estado_checkpoint(dispositivo, desde)
+                desde += len(historial)
+            escritor.agregar_bloque("valores", valores, 'd')
+            escritor.agregar_bloque("timestamps", timestamps, 'q')
+            metadatos['dispositivos'] = dispositivos
+        
+        return escritor.escribir(ruta, metadatos)
+    
+    @staticmethod
+    def _estado_checkpoint(dispositivo, desde):
+        """Metadatos JSON de un sensor (su historial va en los bloques binarios)"""
+        historial = dispositivo.historial
+        estadisticas = dispositivo.estadisticas
+        motor = dispositivo.motor_alarmas
+        return {
+            'clase': type(dispositivo).__name__,
+            'atributos': {nombre: valor for nombre, valor in vars(dispositivo).items()
+                          if nombre not in _ATRIBUTOS_NO_ESCALARES},
+            'historial': {
+                'tipo': 'circular' if isinstance(historial, HistorialCircular) else 'lista',
+                'capacidad': getattr(historial, 'capacidad', None),
+                'desde': desde,
+                'cantidad': len(historial),
+                'total': historial.total_registrado
+            },
+            'estadisticas': [estadisticas.cantidad, estadisticas.media, estadisticas._m2,
+                             estadisticas.minimo, estadisticas.maximo, estadisticas.ultimo],
+            'ventana': dispositivo.estadisticas_ventana.tamano,
+            'motor': None if motor is None else {'activas': motor.activas,
+                                                 'desde': motor._desde}
+        }
+    
+    @classmethod
+    def restaurar_checkpoint(cls, ruta):
+        """
+        ♻️ Reconstruye un SistemaSCADA desde un checkpoint (reinicio en caliente)
+        
+        Los historiales se copian en bloque desde el archivo mapeado en
+        memoria; no se reprocesa ninguna lectura.
+        
+        Returns:
+            SistemaSCADA: Sistema con el mismo estado que al guardar
+        """
+        with CheckpointSCADA(ruta) as checkpoint:
+            metadatos = checkpoint.metadatos
+            scada = cls(metadatos['planta'], modo_columnar='banco' in metadatos)
+            if scada.banco is not None:
+                scada._restaurar_banco(checkpoint)
+            else:
+                for id_dispositivo, estado in metadatos['dispositivos'].items():
+                    scada.registrar_dispositivo(
+                        cls._restaurar_dispositivo(checkpoint, id_dispositivo, estado))
+        
+        # El diario en disco ya tiene su historia; si no hay, se recargan los recientes
+        diario = DiarioEventos(metadatos['ruta_diario'])
+        if diario.ruta is None:
+            for timestamp_ns, dispositivo, codigo, detalle, valor in metadatos['historial_eventos']:
+                diario.registrar(dispositivo, codigo, detalle, valor, timestamp_ns)
+        scada.historial_eventos = diario
+        scada.estado_sistema = metadatos['estado_sistema']
+        scada._version = metadatos['version_instantanea']
+        scada.publicar_instantanea()
+        return scada
+    
+    @staticmethod
+    def _restaurar_dispositivo(checkpoint, id_dispositivo, estado):
+        """Crea el sensor sin pasar por __init__ y le devuelve su estado guardado"""
+        clase = _clase_checkpoint(estado['clase'])
+        dispositivo = clase.__new__(clase)
+        dispositivo.__dict__.update(estado['atributos'])
+        dispositivo.al_cambiar_estado = None
+        dispositivo.al_registrar_lectura = None
+        
+        datos_historial = estado['historial']
+        if datos_historial['tipo'] == 'circular':
+            dispositivo.historial = HistorialCircular(datos_historial['capacidad'])
+        else:
+            dispositivo.historial = HistorialLista()
+        valores, timestamps = checkpoint.historial(id_dispositivo)
+        dispositivo.historial.cargar(valores, timestamps, datos_historial['total'])
+        
+        estadisticas = EstadisticasIncrementales()
+        (estadisticas.cantidad, estadisticas.media, estadisticas._m2,
+         estadisticas.minimo, estadisticas.maximo, estadisticas.ultimo) = estado['estadisticas']
+        dispositivo.estadisticas = estadisticas
+        # La ventana deslizante se reconstruye con las últimas lecturas del historial
+        dispositivo.estadisticas_ventana = EstadisticasVentana(estado['ventana'])
+        for valor in dispositivo.historial.valores(estado['ventana']):
+            dispositivo.estadisticas_ventana.agregar(valor)
+        
+        dispositivo.configurar_alarmas(dispositivo.construir_tabla_alarmas())
+        if estado['motor'] is not None and dispositivo.motor_alarmas is not None:
+            dispositivo.motor_alarmas.activas = list(estado['motor']['activas'])
+            dispositivo.motor_alarmas._desde = list(estado['motor']['desde'])
+        return dispositivo
+    
+    def _restaurar_banco(self, checkpoint):
+        """Copia las columnas del checkpoint al BancoSensores del sistema"""
+        datos = checkpoint.metadatos['banco']
+        banco = self.banco
+        n = len(datos['ids'])
+        banco._reservar(max(n, banco.capacidad))
+        for nombre, tipo in banco.COLUMNAS.items():
+            getattr(banco, nombre)[:n] = np.frombuffer(checkpoint.bloque(f"banco.{nombre}"),
+                                                       dtype=tipo)
+        banco.ids = list(datos['ids'])
+        banco.ubicaciones = list(datos['ubicaciones'])
+        banco.unidades = list(datos['unidades'])
+        banco.tipos_nombre = list(datos['tipos_nombre'])
+        banco.indices = {id_sensor: i for i, id_sensor in enumerate(banco.ids)}
+        banco.cantidad = n
+        banco.operativos = int(np.count_nonzero(banco.codigo[:n] == 0))
+        
+        for i, id_dispositivo in enumerate(banco.ids):
+            self.dispositivos[id_dispositivo] = VistaSensorBanco(banco, i)
+            self._refrescar_contadores(id_dispositivo)
+        self._reconstruir_alarmas()
+
+def paso_7_proyecto_integrador():
     """
     🎯 OBJETIVO: Integrar todos los conceptos POO en un sistema completo
     """
@@ -984,6 +3683,39 @@ def paso_7_proyecto_integrador():
         if ciclo % 2 == 0:  # Cada 2 ciclos, generar reporte
             scada.generar_reporte_ejecutivo()
     
+    # Diario de eventos: registros fijos, memoria acotada
+    print(f"\n📒 ÚLTIMOS EVENTOS DEL DIARIO ({len(scada.historial_eventos)} en total):")
+    for registro in scada.historial_eventos.recientes(3):
+        print(f"   {registro.timestamp} | {registro}")
+    
+    # Top-k incremental: sin ordenar todos los dispositivos
+    print(f"\n🔥 DISPOSITIVOS MÁS COMPROMETIDOS (desviación sobre su límite):")
+    for id_dispositivo, desviacion in scada.dispositivos_criticos(3):
+        print(f"   {id_dispositivo}: {desviacion:+.1%}")
+    
+    # Ciclo asíncrono: todos los dispositivos en paralelo
+    print(f"\n⚡ CICLO DE ESCANEO ASÍNCRONO:")
+    resumen = scada.escanear_dispositivos_concurrente(concurrencia=4, timeout=0.5)
+    print(f"   ✅ {resumen['leidos']} lecturas en {resumen['duracion_s']:.3f}s "
+          f"| ⏱️ timeouts: {len(resumen['timeouts'])}")
+    
+    # Reloj simulado + simulador de señales: ciclos reproducibles sin esperar
+    print(f"\n🧪 CICLOS CON RELOJ Y SEÑALES SIMULADAS (semilla fija):")
+    reloj_real = reloj.fuente
+    simulado = RelojSimulado()
+    reloj.configurar(simulado)
+    if np is not None:
+        scada.configurar_simulador(semilla=42, paso_s=5.0)
+    try:
+        for _ in range(3):
+            scada.escanear_dispositivos()
+            simulado.avanzar(5.0)   # scan_rate de 5 s sin dormir
+        ultimo = scada.dispositivos["TEMP_REACTOR_A"].historial.ultima()
+        print(f"   🕐 Última lectura simulada: {ultimo[0]} → {ultimo[1]:.2f} °C")
+    finally:
+        reloj.configurar(reloj_real)
+        scada.simulador = None
+    
     # Exportar datos para Flask API
     print(f"\n🌐 EXPORTANDO DATOS PARA API FLASK:")
     datos_json = scada.exportar_datos_json()
@@ -991,9 +3723,24 @@ def paso_7_proyecto_integrador():
     print(f"✅ Datos preparados para JSON:")
     print(f"   📊 Planta: {datos_json['planta']}")
     print(f"   🕐 Timestamp: {datos_json['timestamp']}")
+    print(f"   📸 Instantánea: versión {scada.instantanea().version}")
     print(f"   🔧 Dispositivos: {len(datos_json['dispositivos'])}")
     print(f"   🚨 Alarmas: {len(datos_json['alarmas'])}")
     
+    # Versión en streaming: fragmentos listos para enviar en la respuesta HTTP
+    fragmentos = list(scada.exportar_datos_json_stream(tamano_bloque=2))
+    print(f"   🌊 Streaming: {len(fragmentos)} fragmentos, "
+          f"{sum(len(f) for f in fragmentos)} caracteres")
+    
+    # Checkpoint binario: reinicio en caliente sin reconstruir desde la BD
+    print(f"\n♻️ CHECKPOINT PARA REINICIO EN CALIENTE:")
+    ruta_checkpoint = os.path.join(tempfile.gettempdir(), "scada_refineria.ckp")
+    tamano = scada.guardar_checkpoint(ruta_checkpoint)
+    restaurado = SistemaSCADA.restaurar_checkpoint(ruta_checkpoint)
+    print(f"   💾 {tamano} bytes | 🔧 {restaurado.contadores['dispositivos']} dispositivos "
+          f"| 🚨 {restaurado.contadores['alarmas']} alarmas restauradas")
+    os.remove(ruta_checkpoint)
+    
     # Simular preparación para base de datos SQL
     print(f"\n💾 PREPARANDO DATOS PARA BASE DE DATOS SQL:")
     registros_sql = []
@@ -1013,6 +3760,316 @@ def paso_7_proyecto_integrador():
     print(f"✅ {len(registros_sql)} registros preparados para INSERT en SQL")
     print(f"   Formato: (id, ubicacion, valor, unidad, estado, timestamp)")
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# PASO 8: CLASES COMPACTAS CON __slots__ - MILLONES DE DISPOSITIVOS
+# ═══════════════════════════════════════════════════════════════════════════════
+
+"""
+💾 ¿POR QUÉ __slots__?
+
+Cada objeto normal guarda sus atributos en un diccionario propio (__dict__).
+Con __slots__ la clase declara de antemano qué atributos existen y Python los
+guarda en posiciones fijas: sin __dict__ por instancia, mucho menos memoria.
+
+🏭 En un gateway de borde con 512 MB, el overhead por objeto decide cuántos
+dispositivos se pueden alojar. Las variantes "Compacto" reutilizan la lógica
+de las clases originales (los métodos son funciones que se pueden compartir)
+y omiten los print() del constructor.
+"""
+
+class SensorTemperaturaCompacto:
+    """🌡️ Variante con __slots__ de SensorTemperatura (sin historial de lista)"""
+    
+    __slots__ = ("id_sensor", "ubicacion", "temperatura_actual", "estado",
+                 "alarmas_activas", "estadisticas", "estadisticas_ventana")
+    
+    # Misma ventana que el original: el benchmark solo compara __dict__ vs __slots__
+    ventana_estadisticas = SensorTemperatura.ventana_estadisticas
+    
+    def __init__(self, id_sensor, ubicacion, temperatura_inicial=20.0):
+        self.id_sensor = id_sensor
+        self.ubicacion = ubicacion
+        self.temperatura_actual = temperatura_inicial
+        self.estado = "operativo"
+        self.alarmas_activas = []
+        self.estadisticas = EstadisticasIncrementales()
+        self.estadisticas_ventana = EstadisticasVentana(self.ventana_estadisticas)
+        self.estadisticas.agregar(temperatura_inicial)
+        self.estadisticas_ventana.agregar(temperatura_inicial)
+    
+    def actualizar_temperatura(self, nueva_temperatura):
+        """🔄 Igual que SensorTemperatura pero sin lista de historial ni print()"""
+        self.temperatura_actual = nueva_temperatura
+        self.estadisticas.agregar(nueva_temperatura)
+        self.estadisticas_ventana.agregar(nueva_temperatura)
+        self._verificar_alarmas()
+    
+    # Lógica reutilizada de la clase original
+    leer_temperatura = SensorTemperatura.leer_temperatura
+    _verificar_alarmas = SensorTemperatura._verificar_alarmas
+    obtener_estadisticas = SensorTemperatura.obtener_estadisticas
+    generar_reporte = SensorTemperatura.generar_reporte
+
+class SensorIndustrialCompacto:
+    """🏭 Variante con __slots__ de SensorIndustrial (mismo historial circular)"""
+    
+    __slots__ = ("id_sensor", "ubicacion", "unidad_medida", "estado", "historial",
+                 "alarmas", "estadisticas", "estadisticas_ventana", "motor_alarmas",
+                 "al_cambiar_estado", "al_registrar_lectura")
+    
+    capacidad_historial = SensorIndustrial.capacidad_historial
+    ventana_estadisticas = SensorIndustrial.ventana_estadisticas
+    banda_muerta_alarmas = SensorIndustrial.banda_muerta_alarmas
+    retardo_activacion = SensorIndustrial.retardo_activacion
+    retardo_desactivacion = SensorIndustrial.retardo_desactivacion
+    
+    def __init__(self, id_sensor, ubicacion, unidad_medida, historial=None):
+        self.id_sensor = id_sensor
+        self.ubicacion = ubicacion
+        self.unidad_medida = unidad_medida
+        self.estado = "operativo"
+        self.historial = historial if historial is not None else HistorialCircular(
+            self.capacidad_historial
+        )
+        self.alarmas = []
+        self.estadisticas = EstadisticasIncrementales()
+        self.estadisticas_ventana = EstadisticasVentana(self.ventana_estadisticas)
+        self.motor_alarmas = None
+        self.al_cambiar_estado = None
+        self.al_registrar_lectura = None
+    
+    def registrar_lectura(self, valor, timestamp=None):
+        """Registrar una lectura (sin print: pensado para miles de sensores)"""
+        epoch_ns = self.historial.registrar(valor, timestamp)
+        self.estadisticas.agregar(valor)
+        self.estadisticas_ventana.agregar(valor)
+        self.verificar_alarmas(valor, epoch_ns)
+        if self.al_registrar_lectura is not None:
+            self.al_registrar_lectura(self, valor)
+    
+    registrar_lote = SensorIndustrial.registrar_lote
+    construir_tabla_alarmas = SensorIndustrial.construir_tabla_alarmas
+    configurar_alarmas = SensorIndustrial.configurar_alarmas
+    verificar_alarmas = SensorIndustrial.verificar_alarmas
+    _aplicar_transiciones = SensorIndustrial._aplicar_transiciones
+    _publicar_transiciones = SensorIndustrial._publicar_transiciones
+    obtener_ultima_lectura = SensorIndustrial.obtener_ultima_lectura
+    generar_reporte_base = SensorIndustrial.generar_reporte_base
+    total_lecturas = SensorIndustrial.total_lecturas
+    nombre_tipo = SensorIndustrial.nombre_tipo
+
+class SensorTemperaturaAvanzadoCompacto(SensorIndustrialCompacto):
+    """🌡️ Variante con __slots__ de SensorTemperaturaAvanzado"""
+    
+    __slots__ = ("limite_min", "limite_max", "tipo_sensor")
+    
+    def __init__(self, id_sensor, ubicacion, limite_min=-10, limite_max=100, historial=None):
+        super().__init__(id_sensor, ubicacion, "°C", historial)
+        self.limite_min = limite_min
+        self.limite_max = limite_max
+        self.tipo_sensor = "Temperatura"
+        self.configurar_alarmas(self.construir_tabla_alarmas())
+    
+    construir_tabla_alarmas = SensorTemperaturaAvanzado.construir_tabla_alarmas
+    calcular_eficiencia_termica = SensorTemperaturaAvanzado.calcular_eficiencia_termica
+    generar_reporte = SensorTemperaturaAvanzado.generar_reporte
+
+class SensorPresionCompacto(SensorIndustrialCompacto):
+    """💨 Variante con __slots__ de SensorPresion"""
+    
+    __slots__ = ("presion_maxima", "tipo_sensor", "presion_critica")
+    
+    def __init__(self, id_sensor, ubicacion, presion_maxima=10.0, historial=None):
+        super().__init__(id_sensor, ubicacion, "bar", historial)
+        self.presion_maxima = presion_maxima
+        self.tipo_sensor = "Presión"
+        self.presion_critica = presion_maxima * 0.9
+        self.configurar_alarmas(self.construir_tabla_alarmas())
+    
+    construir_tabla_alarmas = SensorPresion.construir_tabla_alarmas
+    calcular_factor_seguridad = SensorPresion.calcular_factor_seguridad
+    generar_reporte = SensorPresion.generar_reporte
+
+class DispositivoModbusCompacto:
+    """🔧 Variante con __slots__ de DispositivoModbus"""
+    
+    __slots__ = ("id_dispositivo", "ip_address", "tipo_dispositivo",
+                 "estado_conexion", "registros_leidos")
+    
+    protocolo = DispositivoModbus.protocolo
+    puerto_default = DispositivoModbus.puerto_default
+    timeout_default = DispositivoModbus.timeout_default
+    dispositivos_totales = 0
+    
+    def __init__(self, id_dispositivo, ip_address, tipo_dispositivo):
+        self.id_dispositivo = id_dispositivo
+        self.ip_address = ip_address
+        self.tipo_dispositivo = tipo_dispositivo
+        self.estado_conexion = "desconectado"
+        self.registros_leidos = {}
+        DispositivoModbusCompacto.dispositivos_totales += 1
+    
+    # classmethod/staticmethod se toman del __dict__ para conservar su tipo
+    obtener_info_protocolo = DispositivoModbus.__dict__["obtener_info_protocolo"]
+    validar_ip = DispositivoModbus.__dict__["validar_ip"]
+    conectar = DispositivoModbus.conectar
+    leer_registro = DispositivoModbus.leer_registro
+    maximo_registros = DispositivoModbus.maximo_registros
+    leer_registros = DispositivoModbus.leer_registros
+
+class DispositivoIoTCompacto:
+    """
+    📡 Variante con __slots__ de DispositivoIoT
+    
+    Conserva el protocolo de métodos especiales (==, <, +, in, [], len) y es
+    comparable con DispositivoIoT. El timestamp de creación se guarda como
+    entero en ns y solo se formatea cuando alguien lo pide.
+    """
+    
+    __slots__ = ("id_dispositivo", "tipo", "valor", "_creacion_ns")
+    
+    # Orden de los campos para el acceso por índice (sin crear listas)
+    _CAMPOS = ("id_dispositivo", "tipo", "valor", "timestamp_creacion")
+    
+    def __init__(self, id_dispositivo, tipo, valor_inicial=0):
+        self.id_dispositivo = id_dispositivo
+        self.tipo = tipo
+        self.valor = valor_inicial
+        self._creacion_ns = reloj.ahora_ns()
+    
+    @property
+    def timestamp_creacion(self):
+        return formatear_timestamp(self._creacion_ns)
+    
+    def __str__(self):
+        return f"Dispositivo {self.id_dispositivo} ({self.tipo}): {self.valor}"
+    
+    def __repr__(self):
+        return f"DispositivoIoTCompacto('{self.id_dispositivo}', '{self.tipo}', {self.valor})"
+    
+    def __eq__(self, otro):
+        if not isinstance(otro, (DispositivoIoT, DispositivoIoTCompacto)):
+            return NotImplemented
+        return self.id_dispositivo == otro.id_dispositivo
+    
+    def __lt__(self, otro):
+        if not isinstance(otro, (DispositivoIoT, DispositivoIoTCompacto)):
+            return NotImplemented
+        return self.valor < otro.valor
+    
+    def __add__(self, otro):
+        if isinstance(otro, (DispositivoIoT, DispositivoIoTCompacto)):
+            return self.valor + otro.valor
+        elif isinstance(otro, (int, float)):
+            return self.valor + otro
+        return NotImplemented
+    
+    def __len__(self):
+        return len(self.id_dispositivo)
+    
+    def __contains__(self, item):
+        return item in self.id_dispositivo
+    
+    def __getitem__(self, index):
+        """📋 Acceso por índice leyendo el atributo directamente"""
+        if isinstance(index, slice):
+            return [getattr(self, campo) for campo in self._CAMPOS[index]]
+        return getattr(self, self._CAMPOS[index])
+    
+    def actualizar_valor(self, nuevo_valor):
+        self.valor = nuevo_valor
+
+def medir_memoria_por_instancia(fabrica, cantidad):
+    """
+    📏 Mide con tracemalloc los bytes por instancia que crea fabrica(i)
+    
+    La lista contenedora se reserva ANTES de empezar a medir para que su
+    tamaño no se cuente como memoria de los objetos.
+    """
+    import tracemalloc
+    
+    objetos = [None] * cantidad
+    tracemalloc.start()
+    inicio, _ = tracemalloc.get_traced_memory()
+    for i in range(cantidad):
+        objetos[i] = fabrica(i)
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objetos
+    return (actual - inicio) / cantidad
+
+def benchmark_memoria_slots(cantidad=1_000_000):
+    """
+    📊 Benchmark de memoria: clases originales vs variantes con __slots__
+    
+    Crea `cantidad` dispositivos IoT y Modbus de cada variante; los sensores
+    industriales (que llevan historial y estadísticas) se miden con 1/100 de
+    la cantidad para mantener acotado el uso de memoria del propio benchmark.
+    
+    Returns:
+        dict: {nombre_par: (bytes_original, bytes_compacto)}
+    """
+    cantidad_sensores = max(1, cantidad // 100)
+    pares = {
+        "DispositivoIoT": (
+            lambda i: DispositivoIoT(f"IOT_{i}", "Temperatura", 25.0),
+            lambda i: DispositivoIoTCompacto(f"IOT_{i}", "Temperatura", 25.0),
+            cantidad),
+        "DispositivoModbus": (
+            lambda i: DispositivoModbus(f"DEV_{i}", "192.168.1.100", "Sensor"),
+            lambda i: DispositivoModbusCompacto(f"DEV_{i}", "192.168.1.100", "Sensor"),
+            cantidad),
+        "SensorTemperatura": (
+            lambda i: SensorTemperatura(f"TEMP_{i}", "Zona A", 25.0),
+            lambda i: SensorTemperaturaCompacto(f"TEMP_{i}", "Zona A", 25.0),
+            cantidad_sensores),
+        "SensorPresion": (
+            lambda i: SensorPresion(f"PRES_{i}", "Zona A", 8.0),
+            lambda i: SensorPresionCompacto(f"PRES_{i}", "Zona A", 8.0),
+            cantidad_sensores),
+    }
+    
+    resultados = {}
+    print(f"\n📊 MEMORIA POR INSTANCIA (tracemalloc)")
+    print(f"{'Clase':<22}{'N':>10}{'Original':>12}{'Compacto':>12}{'Ahorro':>9}")
+    
+    # Los constructores originales publican eventos: se descartan al medir
+    sumidero_anterior = eventos.sumidero
+    eventos.configurar(SumideroNulo())
+    try:
+        for nombre, (original, compacto, n) in pares.items():
+            resultados[nombre] = (medir_memoria_por_instancia(original, n),
+                                  medir_memoria_por_instancia(compacto, n), n)
+    finally:
+        eventos.configurar(sumidero_anterior)
+    
+    for nombre, (bytes_original, bytes_compacto, n) in resultados.items():
+        ahorro = (1 - bytes_compacto / bytes_original) * 100
+        print(f"{nombre:<22}{n:>10,}{bytes_original:>10.0f} B{bytes_compacto:>10.0f} B"
+              f"{ahorro:>8.1f}%")
+    
+    return {nombre: valores[:2] for nombre, valores in resultados.items()}
+
+def paso_8_slots_memoria():
+    """
+    🎯 OBJETIVO: Reducir la memoria por dispositivo con __slots__
+    """
+    print("\n" + "=" * 70)
+    print("PASO 8: CLASES COMPACTAS CON __slots__")
+    print("=" * 70)
+    
+    compacto = DispositivoIoTCompacto("TEMP_SENSOR_01", "Temperatura", 25.5)
+    clasico = DispositivoIoT("TEMP_SENSOR_01", "Temperatura", 30.0)
+    
+    print(f"Tiene __dict__ el clásico: {hasattr(clasico, '__dict__')}")
+    print(f"Tiene __dict__ el compacto: {hasattr(compacto, '__dict__')}")
+    print(f"compacto == clasico: {compacto == clasico}")
+    print(f"compacto[0:3]: {compacto[0:3]}")
+    print(f"'TEMP' in compacto: {'TEMP' in compacto}")
+    
+    # Versión reducida para la clase; benchmark_memoria_slots() usa 1M por defecto
+    benchmark_memoria_slots(100_000)
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # FUNCIÓN PRINCIPAL - EJECUTA TODA LA SECUENCIA DE ENSEÑANZA
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -1037,6 +4094,7 @@ def main():
     paso_5_polimorfismo()
     paso_6_metodos_especiales()
     paso_7_proyecto_integrador()
+    paso_8_slots_memoria()
     
     # Resumen final
     print("\n" + "🎉" * 70)
@@ -1051,6 +4109,7 @@ def main():
     print("   🔸 Polimorfismo")
     print("   🔸 Métodos especiales (dunder methods)")
     print("   🔸 Integración en sistemas industriales")
+    print("   🔸 Clases compactas con __slots__")
     
     print(f"\n🚀 PREPARADO PARA:")
     print("   🏭 Modelar dispositivos PyModbus")
@@ -359,12 +359,15 @@ def generar_reporte_ejecutivo():
         WHERE l.timestamp >= datetime('now', '-24 hours')
         GROUP BY s.id, s.nombre, s.tipo
         ORDER BY num_lecturas DESC
+        LIMIT 3
         """
         
+        # LIMIT deja que SQLite conserve solo los 3 mejores (sin traer ni
+        # ordenar en pandas la lista completa de sensores)
         df_top_sensores = pd.read_sql_query(query_top_sensores, conn)
         
         print("\n🏆 TOP SENSORES MÁS ACTIVOS (24h):")
-        for _, sensor in df_top_sensores.head(3).iterrows():
+        for _, sensor in df_top_sensores.iterrows():
             print(f"  📊 {sensor['nombre']} ({sensor['tipo']})")
             print(f"      Lecturas: {sensor['num_lecturas']}")
             print(f"      Promedio: {sensor['promedio']:.2f}")
@@ -510,6 +513,21 @@ class LecturaDAO:
             """, (sensor_id, valor, calidad))
             return cursor.lastrowid
     
+    def registrar_lecturas_lote(self, filas):
+        """
+        Registra muchas lecturas en una sola transacción
+        
+        filas: iterable de (sensor_id, valor, calidad, timestamp); una sola
+        conexión y un executemany en lugar de un commit por lectura.
+        """
+        with get_db_connection(self.db_name) as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO lecturas (sensor_id, valor, calidad, timestamp)
+                VALUES (?, ?, ?, ?)
+            """, filas)
+            return cursor.rowcount
+    
     def obtener_lecturas_recientes(self, sensor_id, horas=24):
         """Obtiene lecturas recientes de un sensor"""
         with get_db_connection(self.db_name) as conn:
@@ -117,6 +117,8 @@ class SensorAvanzado(Base):
     valor_max = Column(Float)
     precision = Column(Float, default=0.01)
     frecuencia_lectura = Column(Integer, default=60)  # segundos
+    banda_muerta_pct = Column(Float, default=0.0)     # % del último valor guardado
+    silencio_maximo = Column(Integer, default=900)    # segundos (heartbeat)
     
     # Foreign Key hacia la planta
     planta_id = Column(Integer, ForeignKey('plantas_industriales.id'), nullable=False)
@@ -129,6 +131,18 @@ class SensorAvanzado(Base):
     
     def __repr__(self):
         return f"<SensorAvanzado(nombre='{self.nombre}', planta='{self.planta.nombre if self.planta else None}')>"
+        
+    def es_cambio_significativo(self, valor: float, ultimo_valor: Optional[float],
+                                segundos_desde_ultimo: float) -> bool:
+        """Banda muerta: ¿hay que guardar esta lectura?"""
+        # None = columna sin valor (default de la tabla); 0 es un valor válido
+        silencio = 900 if self.silencio_maximo is None else self.silencio_maximo
+        if ultimo_valor is None or segundos_desde_ultimo >= silencio:
+            return True
+        precision = 0.0 if self.precision is None else self.precision
+        porcentaje = 0.0 if self.banda_muerta_pct is None else self.banda_muerta_pct
+        banda = max(precision, porcentaje / 100 * abs(ultimo_valor))
+        return abs(valor - ultimo_valor) > banda
 
 """
 =================================================================
@@ -377,6 +391,7 @@ class GestorPlantasIndustriales:
                     unidad_medida=sensor_data.get('unidad', 'unidades'),
                     valor_min=sensor_data.get('valor_min', 0),
                     valor_max=sensor_data.get('valor_max', 100),
+                    precision=sensor_data.get('precision', 0.01),
                     planta_id=planta.id
                 )
                 self.session.add(sensor)
@@ -452,6 +467,41 @@ class GestorPlantasIndustriales:
         
         print(f"✅ Técnico {tecnico.nombre} asignado a planta {planta.nombre}")
         return True
+        
+    def registrar_lecturas_por_excepcion(self, sensor_id: int,
+                                         lecturas: List[tuple]) -> int:
+        """
+        Guarda solo las lecturas que superan la banda muerta del sensor
+        
+        Args:
+            sensor_id: ID del sensor
+            lecturas: Lista de (timestamp, valor) en orden cronológico
+            
+        Returns:
+            Cantidad de lecturas guardadas
+        """
+        sensor = self.session.query(SensorAvanzado).get(sensor_id)
+        if not sensor:
+            raise ValueError(f"Sensor {sensor_id} no encontrado")
+            
+        # Se compara contra la última lectura GUARDADA (una sola consulta)
+        ultima = self.session.query(LecturaAvanzada.timestamp, LecturaAvanzada.valor)\
+            .filter(LecturaAvanzada.sensor_id == sensor_id)\
+            .order_by(LecturaAvanzada.timestamp.desc())\
+            .first()
+        ultimo_ts, ultimo_valor = ultima if ultima else (None, None)
+        
+        nuevas = []
+        for timestamp, valor in lecturas:
+            segundos = (timestamp - ultimo_ts).total_seconds() if ultimo_ts else float('inf')
+            if sensor.es_cambio_significativo(valor, ultimo_valor, segundos):
+                nuevas.append({'sensor_id': sensor_id, 'valor': valor, 'timestamp': timestamp})
+                ultimo_ts, ultimo_valor = timestamp, valor
+                
+        if nuevas:
+            self.session.bulk_insert_mappings(LecturaAvanzada, nuevas)
+            self.session.commit()
+        return len(nuevas)
 
 """
 =================================================================